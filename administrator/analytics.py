@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncMonth
+
+from administrator.rollup import daily_metric_series, metric_totals
+from core.models import CustomUser, SiteReview
+
+
+CACHE_KEY = 'admin_analytics'
+CACHE_TIMEOUT = 5 * 60
+
+
+def compute_platform_analytics():
+    """
+    Headline numbers and the monthly signups by role for the admin dashboard,
+    using one grouped query per table.
+    """
+    data = CustomUser.objects.aggregate(
+        user_count=Count('id', filter=Q(is_superuser=False)),
+        client_count=Count('id', filter=Q(role='client')),
+        freelancer_count=Count('id', filter=Q(role='freelancer')),
+    )
+
+    # role x month matrix
+    months = []
+    client_counts = []
+    freelancer_counts = []
+    monthly_data = CustomUser.objects.annotate(
+        month=TruncMonth('joined')
+    ).values('month', 'role').annotate(count=Count('id')).order_by('month')
+    for row in monthly_data:
+        month_name = row['month'].strftime('%b %Y')
+        if not months or months[-1] != month_name:
+            months.append(month_name)
+            client_counts.append(0)
+            freelancer_counts.append(0)
+        if row['role'] == 'client':
+            client_counts[-1] += row['count']
+        elif row['role'] == 'freelancer':
+            freelancer_counts[-1] += row['count']
+    data.update(months=months, client_counts=client_counts, freelancer_counts=freelancer_counts)
+
+    # Project and complaint totals come from the rollup rather than counting every row
+    data.update(metric_totals())
+
+    reviews = SiteReview.objects.aggregate(total_reviews=Count('id'), average_rating=Avg('rating'))
+    data['total_reviews'] = reviews['total_reviews']
+    data['average_rating'] = reviews['average_rating'] or 0  # Default to 0 if no reviews
+
+    # Daily time series are read from the rollup, which manage.py update_daily_metrics keeps current
+    data.update(daily_metric_series())
+
+    return data
+
+
+def platform_analytics():
+    # Cached for a few minutes; a new signup clears it (administrator.signals)
+    data = cache.get(CACHE_KEY)
+    if data is None:
+        data = compute_platform_analytics()
+        cache.set(CACHE_KEY, data, CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_platform_analytics():
+    cache.delete(CACHE_KEY)
@@ -1,12 +1,3 @@
-
-
-from django.apps import AppConfig
-
-
-class AdministratorConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'administrator'
-
 from django.apps import AppConfig
 
 
@@ -14,3 +5,5 @@ class AdministratorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'administrator'
 
+    def ready(self):
+        from administrator import export_jobs, signals
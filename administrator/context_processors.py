@@ -1,16 +1,11 @@
-from core.models import CustomUser, Register
-from django.core.exceptions import ObjectDoesNotExist
+from core.viewer import get_viewer
 
 def user_profile(request):
-    if request.user.is_authenticated:
-        try:
-            user = CustomUser.objects.get(id=request.user.id)
-            profile = Register.objects.get(user_id=request.user.id)
-        except ObjectDoesNotExist:
-            # If no profile exists, return user but set profile to None
-            profile = None
+    viewer = get_viewer(request)
+    if viewer:
+        # If no profile exists, profile is None
         return {
-            'user': user,
-            'profile': profile,
+            'user': viewer.user,
+            'profile': viewer.profile,
         }
-    return {}
\ No newline at end of file
+    return {}
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+from django.template.loader import render_to_string
+from xhtml2pdf import pisa
+
+from administrator.exports import COMPLAINT_EXPORT, PROJECT_EXPORT, USER_EXPORT
+from client.models import Complaint, Project
+from core.display_names import display_name_from_row
+from core.export_jobs import export_job
+from core.exports import EXPORT_CHUNK_SIZE, write_csv, write_excel
+from core.models import CustomUser
+
+
+def write_pdf(template, context, output):
+    html = render_to_string(template, context)
+    pisa_status = pisa.CreatePDF(BytesIO(html.encode('utf-8')), dest=output)
+    if pisa_status.err:
+        raise RuntimeError(f'Could not render {template}')
+
+
+def _values(schema, queryset, progress):
+    # values() rows of the schema, with progress reported per chunk
+    total = queryset.count()
+    for index, row in enumerate(queryset.values(*schema.fields).iterator(chunk_size=EXPORT_CHUNK_SIZE), start=1):
+        yield row
+        if index % EXPORT_CHUNK_SIZE == 0:
+            progress(index, total)
+
+
+@export_job('admin_users')
+def build_user_export(params, format, output, progress):
+    users_list = CustomUser.objects.order_by('id')
+    if params.get('year'):
+        users_list = users_list.filter(joined__year=params['year'])
+
+    if format == 'xlsx':
+        return write_excel(USER_EXPORT, users_list, output, 'User List', progress)
+    if format == 'csv':
+        return write_csv(USER_EXPORT, users_list, output, progress)
+
+    user_details = [{
+        'name': f"{row['register__first_name']} {row['register__last_name']}" if row['register__id'] else None,
+        'email': row['email'],
+        'role': row['role'],
+        'status': row['status'],
+        'joined': row['joined'].strftime("%Y-%m-%d") if row['joined'] else None,
+        'phone_number': row['register__phone_number'],
+    } for row in _values(USER_EXPORT, users_list, progress)]
+    write_pdf('Admin/user_list_pdf.html', {'users': user_details}, output)
+
+
+@export_job('admin_complaints')
+def build_complaint_export(params, format, output, progress):
+    complaints_list = Complaint.objects.order_by('id')
+
+    complaint_details = [{
+        'slno': idx,
+        'complainant': row['user__email'],
+        'complaint_type': row['complaint_type'],
+        'subject': row['subject'],
+        'description': row['description'],
+        'status': row['status'],
+        'date_filed': row['date_filed'],
+    } for idx, row in enumerate(_values(COMPLAINT_EXPORT, complaints_list, progress), start=1)]
+    write_pdf('Admin/complaints_pdf.html', {'complaints': complaint_details}, output)
+
+
+@export_job('admin_projects')
+def build_project_export(params, format, output, progress):
+    all_projects = Project.objects.order_by('id')
+
+    project_data = [{
+        'project': row,
+        'client_info': {
+            'name': display_name_from_row(row, 'user__'),
+        }
+    } for row in _values(PROJECT_EXPORT, all_projects, progress)]
+    write_pdf('Admin/projects_pdf.html', {'projects': project_data}, output)
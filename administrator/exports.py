@@ -0,0 +1,55 @@
+from core.display_names import display_name_from_row, name_fields
+from core.exports import ExportSchema, register_export
+
+
+def _register_name(row):
+    if row['register__id'] is None:
+        return None
+    return f"{row['register__first_name']} {row['register__last_name']}"
+
+
+def _date(field):
+    return lambda row: row[field].strftime('%Y-%m-%d') if row[field] else None
+
+
+USER_EXPORT = register_export(ExportSchema(
+    name='admin_users',
+    filename='user_list',
+    fields=['email', 'role', 'status', 'joined', 'register__id', 'register__first_name', 'register__last_name', 'register__phone_number'],
+    columns=[
+        ('Name/Company', _register_name),
+        ('Email', lambda row: row['email']),
+        ('User Type', lambda row: row['role']),
+        ('Status', lambda row: row['status']),
+        ('Date Joined', _date('joined')),
+        ('Phone Number', lambda row: row['register__phone_number']),
+    ],
+    numbered=True,
+))
+
+PROJECT_EXPORT = register_export(ExportSchema(
+    name='admin_projects',
+    filename='projects',
+    fields=['title', 'category', 'total_including_gst', 'project_status', *name_fields('user__')],
+    columns=[
+        ('Client Name', lambda row: display_name_from_row(row, 'user__')),
+        ('Project Title', lambda row: row['title']),
+        ('Category', lambda row: row['category']),
+        ('Budget(@18% gst)', lambda row: row['total_including_gst']),
+        ('Status', lambda row: row['project_status']),
+    ],
+))
+
+COMPLAINT_EXPORT = register_export(ExportSchema(
+    name='admin_complaints',
+    filename='complaint_list',
+    fields=['user__email', 'complaint_type', 'subject', 'description', 'status', 'date_filed'],
+    columns=[
+        ('Complainant', lambda row: row['user__email']),
+        ('Complaint Type', lambda row: row['complaint_type']),
+        ('Subject', lambda row: row['subject']),
+        ('Description', lambda row: row['description']),
+        ('Status', lambda row: row['status']),
+        ('Date Filed', _date('date_filed')),
+    ],
+))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from administrator.analytics import invalidate_platform_analytics
+from administrator.rollup import update_daily_metrics
+
+
+class Command(BaseCommand):
+    help = 'Roll up signups, projects, GMV and complaints into the daily platform metrics table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Recompute every day instead of starting at the watermark')
+        parser.add_argument('--loop', action='store_true', help='Keep running and roll up again every --interval seconds')
+        parser.add_argument('--interval', type=int, default=900, help='Seconds between rollups when --loop is given')
+
+    def handle(self, *args, **options):
+        rebuild = options['rebuild']
+        while True:
+            count = update_daily_metrics(rebuild=rebuild)
+            invalidate_platform_analytics()
+            self.stdout.write(f'Updated {count} days of metrics')
+            if not options['loop']:
+                break
+            rebuild = False
+            time.sleep(options['interval'])
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrator', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('signups', models.PositiveIntegerField(default=0)),
+                ('client_signups', models.PositiveIntegerField(default=0)),
+                ('freelancer_signups', models.PositiveIntegerField(default=0)),
+                ('projects_posted', models.PositiveIntegerField(default=0)),
+                ('projects_completed_total', models.PositiveIntegerField(default=0)),
+                ('gmv', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('complaints', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrator', '0002_dailymetric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailymetric',
+            name='projects_in_progress_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -8,3 +8,23 @@ class Template(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class DailyMetric(models.Model):
+    # One row per day, maintained by administrator.rollup
+    date = models.DateField(unique=True)
+    signups = models.PositiveIntegerField(default=0)
+    client_signups = models.PositiveIntegerField(default=0)
+    freelancer_signups = models.PositiveIntegerField(default=0)
+    projects_posted = models.PositiveIntegerField(default=0)
+    projects_completed_total = models.PositiveIntegerField(default=0)  # snapshot taken on that day
+    projects_in_progress_total = models.PositiveIntegerField(default=0)  # snapshot taken on that day
+    gmv = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    complaints = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date']
+
+    def __str__(self):
+        return f'Metrics for {self.date}'
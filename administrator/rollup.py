@@ -0,0 +1,163 @@
+import datetime
+from collections import defaultdict
+
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+
+from administrator.models import DailyMetric
+from client.models import Complaint, PaymentInstallment, Project
+from core.models import CustomUser
+
+
+METRIC_FIELDS = [
+    'signups', 'client_signups', 'freelancer_signups', 'projects_posted',
+    'projects_completed_total', 'projects_in_progress_total', 'gmv', 'complaints',
+]
+SERIES_DAYS = 90
+
+
+def _source_rows(since):
+    # (day, {metric: value}) pairs from one grouped query per source table,
+    # limited to rows dated `since` or later (everything when since is None)
+    users = CustomUser.objects.filter(is_superuser=False)
+    projects = Project.objects.all()
+    installments = PaymentInstallment.objects.filter(status='paid', paid_at__isnull=False)
+    complaints = Complaint.objects.all()
+    if since:
+        since_dt = datetime.datetime.combine(since, datetime.time.min)
+        users = users.filter(joined__gte=since_dt)
+        projects = projects.filter(created_at__gte=since_dt)
+        installments = installments.filter(paid_at__gte=since)
+        complaints = complaints.filter(date_filed__gte=since_dt)
+
+    for day, signups, clients, freelancers in users.annotate(day=TruncDate('joined')).values('day').annotate(
+        signups=Count('id'),
+        client_signups=Count('id', filter=Q(role='client')),
+        freelancer_signups=Count('id', filter=Q(role='freelancer')),
+    ).values_list('day', 'signups', 'client_signups', 'freelancer_signups').order_by():
+        yield day, {'signups': signups, 'client_signups': clients, 'freelancer_signups': freelancers}
+
+    for day, posted in projects.annotate(day=TruncDate('created_at')).values('day').annotate(
+        posted=Count('id')
+    ).values_list('day', 'posted').order_by():
+        yield day, {'projects_posted': posted}
+
+    for day, gmv in installments.values(day=F('paid_at')).annotate(
+        gmv=Sum('amount')
+    ).values_list('day', 'gmv').order_by():
+        yield day, {'gmv': gmv}
+
+    for day, filed in complaints.annotate(day=TruncDate('date_filed')).values('day').annotate(
+        filed=Count('id')
+    ).values_list('day', 'filed').order_by():
+        yield day, {'complaints': filed}
+
+
+def update_daily_metrics(today=None, rebuild=False):
+    """
+    Bring the DailyMetric rollup up to date and return the number of days written.
+
+    The watermark is the latest day already in the table: only source rows
+    dated from that day on are aggregated, and only the days from the
+    watermark to today are rewritten, so a run costs the same no matter how
+    much history there is. Earlier days are final. `rebuild` recomputes
+    everything, e.g. after back-dated edits.
+
+    There is no completion timestamp on Project, so projects_completed_total
+    and projects_in_progress_total are snapshots of the counts taken on each
+    day the rollup runs; days without a run carry the previous snapshot
+    forward.
+    """
+    today = today or datetime.date.today()
+    watermark = None if rebuild else DailyMetric.objects.aggregate(last=Max('date'))['last']
+
+    days = defaultdict(dict)
+    for day, values in _source_rows(watermark):
+        days[day].update(values)
+
+    start = watermark or min(days, default=today)
+    start = min(start, today)
+
+    snapshot_fields = ['projects_completed_total', 'projects_in_progress_total']
+    existing = {
+        row[0]: row[1:]
+        for row in DailyMetric.objects.filter(date__gte=start).values_list('date', *snapshot_fields)
+    }
+    snapshot = Project.objects.aggregate(
+        completed=Count('id', filter=Q(project_status='Completed')),
+        in_progress=Count('id', filter=Q(project_status='In Progress')),
+    )
+    carried = DailyMetric.objects.filter(date__lt=start).order_by('-date').values_list(
+        *snapshot_fields
+    ).first() or (0, 0)
+
+    metrics = []
+    day = start
+    while day <= today:
+        values = days.get(day, {})
+        if day == today:
+            carried = (snapshot['completed'], snapshot['in_progress'])
+        elif day in existing:
+            carried = existing[day]
+        metrics.append(DailyMetric(
+            date=day,
+            signups=values.get('signups', 0),
+            client_signups=values.get('client_signups', 0),
+            freelancer_signups=values.get('freelancer_signups', 0),
+            projects_posted=values.get('projects_posted', 0),
+            projects_completed_total=carried[0],
+            projects_in_progress_total=carried[1],
+            gmv=values.get('gmv') or 0,
+            complaints=values.get('complaints', 0),
+        ))
+        day += datetime.timedelta(days=1)
+
+    DailyMetric.objects.bulk_create(
+        metrics,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['date'],
+        update_fields=METRIC_FIELDS + ['updated_at'],
+    )
+    return len(metrics)
+
+
+def daily_metric_series(days=SERIES_DAYS, today=None):
+    # Chart-ready lists for the last `days` days, read straight from the rollup
+    today = today or datetime.date.today()
+    rows = DailyMetric.objects.filter(
+        date__gt=today - datetime.timedelta(days=days), date__lte=today
+    ).values_list('date', 'signups', 'projects_posted', 'projects_completed_total', 'gmv', 'complaints')
+
+    series = {
+        'metric_dates': [], 'signup_series': [], 'posted_series': [],
+        'completed_series': [], 'gmv_series': [], 'complaint_series': [],
+    }
+    for date, signups, posted, completed, gmv, complaints in rows:
+        series['metric_dates'].append(date.strftime('%d %b'))
+        series['signup_series'].append(signups)
+        series['posted_series'].append(posted)
+        series['completed_series'].append(completed)
+        series['gmv_series'].append(float(gmv))
+        series['complaint_series'].append(complaints)
+    return series
+
+
+def metric_totals():
+    """
+    Project and complaint totals for the dashboard, read from the rollup.
+
+    Posted projects and complaints are summed over the daily rows, so rows
+    deleted later still count. The completed and in-progress counts are the
+    latest snapshot.
+    """
+    totals = DailyMetric.objects.aggregate(posted=Sum('projects_posted'), complaints=Sum('complaints'))
+    latest = DailyMetric.objects.order_by('-date').values_list(
+        'projects_completed_total', 'projects_in_progress_total'
+    ).first() or (0, 0)
+    return {
+        'posted_count': totals['posted'] or 0,
+        'completed_count': latest[0],
+        'in_progress_count': latest[1],
+        'total_complaint': totals['complaints'] or 0,
+    }
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from administrator.analytics import invalidate_platform_analytics
+from core.models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def reset_analytics_on_signup(sender, instance, created, **kwargs):
+    if created:
+        invalidate_platform_analytics()
@@ -1,3 +1,19 @@
+from core.tests import QueryBudgetTestCase
 
-from django.test import TestCase
-from django.test import TestCase
+
+class AdministratorQueryBudgetTests(QueryBudgetTestCase):
+    def test_admin_view(self):
+        self.get('admin0', '/administrator/admin_view/')
+
+    def test_allusers(self):
+        self.get('admin0', '/administrator/allusers/')
+
+    def test_exports(self):
+        for path in [
+            '/administrator/export_users/?format=excel',
+            '/administrator/export_complaints_excel/',
+            '/administrator/export_complaints_excel/?format=csv',
+            '/administrator/export_projects_excel/',
+        ]:
+            with self.subTest(path):
+                self.get('admin0', path)
@@ -6,7 +6,10 @@ from django.shortcuts import redirect, render
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, get_object_or_404
 from client.models import ClientProfile, Complaint
-from core.decorators import nocache
+from core.decorators import nocache, query_budget
+from core.viewer import get_viewer
+from core.display_names import display_name, display_names
+from administrator.analytics import platform_analytics
 from core.models import CustomUser, Notification, Register, SiteReview
 from freelancer.models import FreelancerProfile
 
@@ -22,53 +25,15 @@ from client.models import Project
 
 @login_required
 @nocache
+@query_budget(40)
 def admin_view(request):
     if 'uid' not in request.session and not request.user.is_authenticated:
         return redirect('login_view')
     
     uid = request.user.id
     
-    user_count=CustomUser.objects.filter(is_superuser=False).count()
-    client_count = CustomUser.objects.filter(role='client').count()
-    freelancer_count = CustomUser.objects.filter(role='freelancer').count()
-
-    # Aggregate monthly user counts
-    monthly_data = CustomUser.objects.annotate(month=TruncMonth('joined')).values('month').annotate(count=Count('id')).order_by('month')
-
-    months = []
-    client_counts = []
-    freelancer_counts = []
-
-    for month in monthly_data:
-        month_name = month['month'].strftime('%b %Y')
-        months.append(month_name)
-        client_counts.append(CustomUser.objects.filter(role='client', joined__month=month['month'].month, joined__year=month['month'].year).count())
-        freelancer_counts.append(CustomUser.objects.filter(role='freelancer', joined__month=month['month'].month, joined__year=month['month'].year).count())
-
-    posted_count = Project.objects.all().count()
-    completed_count = Project.objects.filter(project_status='Completed').count()
-    in_progress_count = Project.objects.filter(project_status='In Progress').count()
-    total_complaints=Complaint.objects.all().count()
-    
-    total_reviews = SiteReview.objects.count()  # Count of site reviews
-
-    # Calculate average rating for site reviews
-    from django.db.models import Avg
-    average_rating = SiteReview.objects.aggregate(Avg('rating'))['rating__avg'] or 0  # Default to 0 if no reviews
-
-    return render(request, 'Admin/index.html', {
-        'months': months,
-        'client_counts': client_counts,
-        'freelancer_counts': freelancer_counts,
-        # Add project statistics to context
-        'posted_count': posted_count,
-        'completed_count': completed_count,
-        'in_progress_count': in_progress_count,
-        'user_count': user_count,
-        'total_complaint': total_complaints,  # Add total complaints count to context
-        'total_reviews': total_reviews,  # Add total reviews count to context
-        'average_rating': average_rating,  # Add average rating to context
-    })
+    # Role x month signups and the KPIs come from a few grouped queries (cached)
+    return render(request, 'Admin/index.html', platform_analytics())
 
 
 @login_required
@@ -155,8 +120,9 @@ def toggle_permission(request, uid):
 def account_settings(request):
     uid=request.user.id
     
-    profile1 = CustomUser.objects.get(id=uid)
-    profile=Register.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile = viewer.profile
     
     return render(request, 'Admin/profile.html',{'profile1':profile1,'profile':profile})
 
@@ -169,8 +135,9 @@ def change_password(request, uid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
 
     if request.method == 'POST':
         current = request.POST.get('current_password')
@@ -204,8 +171,9 @@ def change_profile_image(request,uid):
         return redirect('login_view')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     if request.method=='POST':
         
         profile_picture = request.FILES.get('profile_picture')
@@ -313,24 +281,7 @@ def send_permission_email(uid):
     print(uid)
     subject = 'Access Granted: Welcome to FreelanceHub!'
     
-    if user.role == 'client':
-        client_profile = ClientProfile.objects.get(user_id=uid)
-        if client_profile.client_type == 'Individual':
-            
-            register_info = Register.objects.get(user_id=uid)
-            first_name = register_info.first_name
-            last_name = register_info.last_name
-            name = f"{first_name} {last_name}"
-        else:  
-            
-            company_name = client_profile.company_name
-            name = company_name
-    else:  
-        
-        register_info = Register.objects.get(user=uid)
-        first_name = register_info.first_name
-        last_name = register_info.last_name
-        name = f"{first_name} {last_name}"
+    name = display_name(uid)
     
     context = {
         'user_name': name
@@ -350,24 +301,7 @@ def send_permission_denied_email(uid):
     user = CustomUser.objects.get(id=uid)
     subject = 'Permission Denied'
     
-    if user.role == 'client':
-        client_profile = ClientProfile.objects.get(user_id=uid)
-        if client_profile.client_type == 'Individual':
-            
-            register_info = Register.objects.get(user_id=uid)
-            first_name = register_info.first_name
-            last_name = register_info.last_name
-            name = f"{first_name} {last_name}"
-        else:  
-            
-            company_name = client_profile.company_name
-            name = company_name
-    else:  
-        
-        register_info = Register.objects.get(user_id=uid)
-        first_name = register_info.first_name
-        last_name = register_info.last_name
-        name = f"{first_name} {last_name}"
+    name = display_name(uid)
     
     
     context = {
@@ -387,24 +321,7 @@ def send_permission_denied_email(uid):
 def send_deactivation_email(uid):
     subject = 'Account Deactivation Notice'
     user = CustomUser.objects.get(id=uid)
-    if user.role == 'client':
-        client_profile = ClientProfile.objects.get(user_id=uid)
-        if client_profile.client_type == 'Individual':
-            
-            register_info = Register.objects.get(user_id=uid)
-            first_name = register_info.first_name
-            last_name = register_info.last_name
-            name = f"{first_name} {last_name}"
-        else:  
-            
-            company_name = client_profile.company_name
-            name = company_name
-    else:  
-        
-        register_info = Register.objects.get(user_id=uid)
-        first_name = register_info.first_name
-        last_name = register_info.last_name
-        name = f"{first_name} {last_name}"
+    name = display_name(uid)
     
     context = {
         'user_name': name
@@ -421,24 +338,7 @@ def send_deactivation_email(uid):
 def send_activation_email(uid):
     subject = 'Account Activation Notice'
     user = CustomUser.objects.get(id=uid)
-    if user.role == 'client':
-        client_profile = ClientProfile.objects.get(user_id=uid)
-        if client_profile.client_type == 'Individual':
-            
-            register_info = Register.objects.get(user_id=uid)
-            first_name = register_info.first_name
-            last_name = register_info.last_name
-            name = f"{first_name} {last_name}"
-        else:  
-            
-            company_name = client_profile.company_name
-            name = company_name
-    else:  
-        
-        register_info = Register.objects.get(user_id=uid)
-        first_name = register_info.first_name
-        last_name = register_info.last_name
-        name = f"{first_name} {last_name}"
+    name = display_name(uid)
     
     context = {
         'user_name': name
@@ -487,14 +387,34 @@ def reviews(request):
 
 
 from datetime import datetime
+from urllib.parse import urlencode
+@query_budget(20)
 def allusers(request):
-    # Fetch all non-admin users
-    users_list = CustomUser.objects.filter(is_superuser=False)
+    # Non-admin users, filtered and paged in the database; only the visible page is loaded
+    users_list = CustomUser.objects.filter(is_superuser=False).select_related('register').order_by('-joined', '-id')
+
+    role = request.GET.get('role', '')
+    status = request.GET.get('status', '')
+    year = request.GET.get('year', '')
+    role = role if role in (CustomUser.CLIENT, CustomUser.FREELANCER) else ''
+    status = status if status in (CustomUser.STATUS_ACTIVE, CustomUser.STATUS_INACTIVE) else ''
+    year = year if year.isdigit() else ''
+    if role:
+        users_list = users_list.filter(role=role)
+    if status:
+        users_list = users_list.filter(status=status)
+    if year:
+        users_list = users_list.filter(joined__year=int(year))
+
+    paginator = Paginator(users_list, 10)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
     current_year = datetime.now().year
+    names = display_names(user.id for user in page_obj)
     user_details = []
-    for user in users_list:
+    for user in page_obj:
         # Fetch related information from Register table
-        register_info = Register.objects.filter(user=user).first()
+        register_info = getattr(user, 'register', None)
         
         # Base user details
         user_data = {
@@ -514,26 +434,24 @@ def allusers(request):
             user_data['freelancer_name'] = f"{register_info.first_name} {register_info.last_name}" if register_info else None
         
         if user.role.lower() == 'client':
-            profile = ClientProfile.objects.filter(user=user).first()
-            if profile:
-                if profile.client_type == 'Individual':
-                    user_data['name'] = f"{register_info.first_name} {register_info.last_name}" if register_info else None
-                elif profile.client_type == 'Company':
-                    user_data['name'] = profile.company_name if profile.company_name else None
+            user_data['name'] = names.get(user.id) or None
         
         user_details.append(user_data)
-    
-    # Pagination
-    paginator = Paginator(user_details, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+
+    # Filters carried over to the pager links
+    filter_query = urlencode({key: value for key, value in (('role', role), ('status', status), ('year', year)) if value})
 
     context = {
-        'users': page_obj,
-        'current_year': current_year
+        'users': user_details,
+        'page_obj': page_obj,
+        'current_year': current_year,
+        'selected_role': role,
+        'selected_status': status,
+        'selected_year': year,
+        'filter_query': filter_query,
     }
     
-    return render(request, 'Admin/allusers.html', context)
+    return render(request, 'Admin/AllUsers.html', context)
 
 
 
@@ -541,9 +459,9 @@ def allusers(request):
 # views.py
 from django.http import HttpResponse
 from core.models import CustomUser, Register  # Assuming you have these models
-import openpyxl
-from xhtml2pdf import pisa
-from io import BytesIO
+from administrator.exports import COMPLAINT_EXPORT, PROJECT_EXPORT, USER_EXPORT
+from core.export_jobs import export_job_response
+from core.exports import export_response
 
 @login_required
 @nocache
@@ -556,97 +474,36 @@ def export_users_to_excel(request):
     else:
         users_list = CustomUser.objects.all()
 
-    # Create an Excel workbook and worksheet
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'User List'
-
-    # Define headers
-    headers = ['#', 'Name/Company', 'Email', 'User Type', 'Status', 'Date Joined', 'Phone Number']
-    ws.append(headers)
-
-    # Add data rows
-    for idx, user in enumerate(users_list, start=1):
-        register_info = Register.objects.filter(user=user).first()
-        name = f"{register_info.first_name} {register_info.last_name}" if register_info else None
-
-        row = [
-            idx,
-            name,
-            user.email,
-            user.role,
-            user.status,
-            user.joined.strftime("%Y-%m-%d") if user.joined else None,
-            register_info.phone_number if register_info else None
-        ]
-        ws.append(row)
-
-    # Create HTTP response
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="user_list.xlsx"'
-
-    wb.save(response)
-    return response
+    return export_response(request, USER_EXPORT, users_list.order_by('id'), title='User List')
 
 
 @login_required
 @nocache
 def export_users_to_pdf(request):
-    year = request.GET.get('year', None)
-    
-    # Filter users based on the year if provided
-    if year:
-        users_list = CustomUser.objects.filter(joined__year=year)
-    else:
-        users_list = CustomUser.objects.all()
-
-    # Prepare user details
-    user_details = []
-    for user in users_list:
-        register_info = Register.objects.filter(user=user).first()
-        name = f"{register_info.first_name} {register_info.last_name}" if register_info else None
-
-        user_details.append({
-            'index': len(user_details) + 1,
-            'name': name,
-            'email': user.email,
-            'role': user.role,
-            'status': user.status,
-            'joined': user.joined.strftime("%Y-%m-%d") if user.joined else None,
-            'phone_number': register_info.phone_number if register_info else None
-        })
-
-    # Render the PDF template
-    context = {'users': user_details}
-    html = render_to_string('Admin/user_list_pdf.html', context)
-    
-    # Create PDF
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="user_list.pdf"'
-    
-    pisa_status = pisa.CreatePDF(BytesIO(html.encode('utf-8')), dest=response)
-    
-    if pisa_status.err:
-        return HttpResponse('We had some errors <pre>' + html + '</pre>')
-    
-    return response
+    return export_users_job(request, 'pdf')
 
 
 @login_required
 @nocache
+@query_budget(15)
 def export_users(request):
-    year = request.GET.get('year', None)
-    
     # Check the export format
     export_format = request.GET.get('format', None)
     if export_format == 'excel':
-        return export_users_to_excel(request)  # Function to handle Excel export
-    elif export_format == 'pdf':
-        return export_users_to_pdf(request)  # Function to handle PDF export
+        return export_users_job(request, 'xlsx')
+    elif export_format in ('csv', 'pdf'):
+        return export_users_job(request, export_format)
     else:
         return HttpResponse("Invalid format", status=400)  # Handle invalid format
 
 
+def export_users_job(request, export_format):
+    # Built by the export worker (administrator.export_jobs); the page polls until the file is ready
+    year = request.GET.get('year') or None
+    params = {'year': int(year)} if year and year.isdigit() else {}
+    return export_job_response(request, 'admin_users', export_format, params, f'user_list.{export_format}')
+
+
 def complaints(request):
     complaints_list = Complaint.objects.all()
     
@@ -660,95 +517,33 @@ def complaints(request):
 
 
 
+@login_required
+@query_budget(15)
 def export_complaints_pdf(request):
-    # Fetch all complaints
-    complaints_list = Complaint.objects.all()
-
-    # Prepare complaint details
-    complaint_details = []
-    for idx, complaint in enumerate(complaints_list, start=1):
-        complaint_details.append({
-            'slno': idx,
-            'complainant': complaint.user,
-            'complaint_type': complaint.complaint_type,
-            'subject': complaint.subject,
-            'description': complaint.description,
-            'status': complaint.status,
-            'date_filed': complaint.date_filed.strftime("%Y-%m-%d") if complaint.date_filed else None,
-        })
-
-    # Render the PDF template
-    context = {'complaints': complaint_details}
-    html = render_to_string('Admin/complaints_pdf.html', context)
-    
-    # Create PDF
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="complaint_list.pdf"'
-    
-    pisa_status = pisa.CreatePDF(BytesIO(html.encode('utf-8')), dest=response)
-    
-    if pisa_status.err:
-        return HttpResponse('We had some errors <pre>' + html + '</pre>')
-    
-    return response
+    return export_job_response(request, 'admin_complaints', 'pdf', {}, 'complaint_list.pdf')
 
 
 
-import pandas as pd
+@query_budget(15)
 def export_complaints_excel(request):
-    # Fetch all complaints
-    complaints_list = Complaint.objects.all()
-    
-    # Prepare complaint details for DataFrame
-    data = []
-    for complaint in complaints_list:
-        data.append({
-            'Complainant': complaint.user,
-            'Complaint Type': complaint.complaint_type,
-            'Subject': complaint.subject,
-            'Description': complaint.description,
-            'Status': complaint.status,
-            'Date Filed': complaint.date_filed.strftime("%Y-%m-%d") if complaint.date_filed else None,
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Create an HTTP response with Excel content
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="complaint_list.xlsx"'
-    
-    # Write DataFrame to Excel
-    df.to_excel(response, index=False)
-    
-    return response
+    return export_response(request, COMPLAINT_EXPORT, Complaint.objects.order_by('id'))
 
 
 
 
 def projects(request):
-    all_projects = Project.objects.all()
+    all_projects = Project.objects.select_related('user__register')
 
     project_data = []
 
+    client_names = display_names(project.user_id for project in all_projects)
+
     for project in all_projects:
-        # Fetch the client profile related to the project
-        client_profile = ClientProfile.objects.get(user=project.user)
-        
-        # Fetch the register details of the client
-        register_profile = Register.objects.get(user=project.user)
-
-        # Determine client info based on client type
-        if client_profile.client_type == 'Individual':
-            client_info = {
-                'name': f"{register_profile.first_name} {register_profile.last_name}",
-                'profile_picture': register_profile.profile_picture
-            }
-        elif client_profile.client_type == 'Company':
-            client_info = {
-                'name': client_profile.company_name,
-                'profile_picture': register_profile.profile_picture
-            }
+        register_profile = getattr(project.user, 'register', None)
+        client_info = {
+            'name': client_names.get(project.user_id),
+            'profile_picture': register_profile.profile_picture if register_profile else None
+        }
 
         project_data.append({
             'project': project,
@@ -763,65 +558,15 @@ def projects(request):
 
 
 
+@query_budget(15)
 def export_projects_excel(request):
-    # Fetch all projects
-    all_projects = Project.objects.all()
+    return export_response(request, PROJECT_EXPORT, Project.objects.order_by('id'))
 
-    data = []
-    for project in all_projects:
-        client_profile = ClientProfile.objects.get(user=project.user)
-        register_profile = Register.objects.get(user=project.user)
-        
-        client_name = f"{register_profile.first_name} {register_profile.last_name}" if client_profile.client_type == 'Individual' else client_profile.company_name
-        
-        data.append({
-            
-            'Client Name': client_name,
-            'Project Title': project.title,
-            'Category': project.category,
-            'Budget(@18% gst)': project.total_including_gst,
-            'Status': project.project_status
-        })
-    
-    df = pd.DataFrame(data)
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename=projects.xlsx'
-    
-    df.to_excel(response, index=False)
-    return response
-
-
-from xhtml2pdf import pisa
-from io import BytesIO
 
+@login_required
+@query_budget(15)
 def export_projects_pdf(request):
-    all_projects = Project.objects.all()
-    
-    project_data = []
-    for project in all_projects:
-        client_profile = ClientProfile.objects.get(user=project.user)
-        register_profile = Register.objects.get(user=project.user)
-        
-        client_name = f"{register_profile.first_name} {register_profile.last_name}" if client_profile.client_type == 'Individual' else client_profile.company_name
-        
-        project_data.append({
-            'project': project,
-            'client_info': {
-                'name': client_name,
-                'profile_picture': register_profile.profile_picture.url  # Not used in the template
-            }
-        })
-
-    html_string = render_to_string('Admin/projects_pdf.html', {'projects': project_data})
-    result = BytesIO()
-    pdf = pisa.CreatePDF(BytesIO(html_string.encode("UTF-8")), dest=result)
-
-    if pdf.err:
-        return HttpResponse("Error generating PDF", status=500)
-
-    response = HttpResponse(result.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="projects_report.pdf"'
-    return response
+    return export_job_response(request, 'admin_projects', 'pdf', {}, 'projects_report.pdf')
 
 from django.shortcuts import render, redirect
 from .models import Template
@@ -1,11 +1,3 @@
-
-from django.apps import AppConfig
-
-
-class ClientConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'client'
-
 from django.apps import AppConfig
 
 
@@ -13,3 +5,5 @@ class ClientConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'client'
 
+    def ready(self):
+        from client import export_jobs
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+
+from client.models import Message
+
+
+# Seconds between keep-alive comments on an idle event stream
+STREAM_KEEPALIVE = 15
+
+
+def message_payload(message):
+    return {
+        'id': message.id,
+        'sender_id': message.sender_id,
+        'content': message.content if message.content else '',
+        'image': message.image.url if message.image and hasattr(message.image, 'url') else None,
+        'file': message.file.url if message.file and hasattr(message.file, 'url') else None,
+        'timestamp': message.timestamp.isoformat(),
+    }
+
+
+def payload_for_user(payload, user):
+    data = {key: value for key, value in payload.items() if key != 'sender_id'}
+    data['type'] = 'sent' if payload['sender_id'] == user.id else 'received'
+    return data
+
+
+def serialize_message(message, user):
+    return payload_for_user(message_payload(message), user)
+
+
+def fetch_room_messages(chat_room_id, user, after_id=None, since=None):
+    """
+    Return the messages of a chat room newer than the client's cursor together
+    with the room's new high-water mark.
+
+    Messages are ordered by id, which follows insertion order, so the id of the
+    last message returned is a stable cursor for the next poll. `since` (an ISO
+    timestamp) is accepted for clients that only kept the last timestamp.
+    """
+    messages = Message.objects.filter(chat_room_id=chat_room_id)
+
+    if after_id:
+        messages = messages.filter(id__gt=after_id)
+    elif since:
+        since_dt = parse_datetime(since)
+        if since_dt:
+            messages = messages.filter(timestamp__gt=since_dt)
+
+    messages_list = [serialize_message(message, user) for message in messages.order_by('id')]
+
+    last_id = messages_list[-1]['id'] if messages_list else (after_id or 0)
+    return messages_list, last_id
+
+
+class InProcessBroker:
+    """
+    Fan out chat messages to the streams open in this process.
+
+    Every subscriber is an asyncio queue bound to the event loop that created
+    it; publishing may happen from a sync view running in a worker thread, so
+    payloads are handed over with `call_soon_threadsafe`. This is enough for
+    development, tests and single-process deployments. Multi-process setups
+    should point CHAT_BROKER_BACKEND at a broker sharing the same interface
+    (`subscribe`, `unsubscribe`, `publish`) backed by e.g. Redis pub/sub.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, chat_room_id):
+        queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(str(chat_room_id), set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, chat_room_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(str(chat_room_id))
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[str(chat_room_id)]
+
+    def publish(self, chat_room_id, payload):
+        with self._lock:
+            subscribers = list(self._subscribers.get(str(chat_room_id), ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, payload)
+            except RuntimeError:
+                # The loop of a dropped connection is already closed
+                self.unsubscribe(chat_room_id, (loop, queue))
+
+    async def listen(self, subscriber, timeout):
+        """Wait for the next payload; returns None when the timeout expires."""
+        try:
+            return await asyncio.wait_for(subscriber[1].get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(settings, 'CHAT_BROKER_BACKEND', 'client.chat.InProcessBroker')
+                _broker = import_string(backend)()
+    return _broker
+
+
+def publish_message(message):
+    """Push a saved message to the subscribers of its chat room once committed."""
+    payload = message_payload(message)
+    transaction.on_commit(lambda: get_broker().publish(message.chat_room_id, payload))
+
+
+def _sse_event(data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def stream_room_messages(chat_room_id, user, after_id):
+    broker = get_broker()
+    # Subscribe before reading the backlog so nothing is lost in between
+    subscriber = broker.subscribe(chat_room_id)
+    try:
+        messages_list, last_id = await sync_to_async(fetch_room_messages)(chat_room_id, user, after_id=after_id)
+        yield 'retry: 3000\n\n'
+        yield _sse_event({'messages': messages_list, 'last_id': last_id}, last_id)
+
+        while True:
+            payload = await broker.listen(subscriber, STREAM_KEEPALIVE)
+            if payload is None:
+                yield ': keep-alive\n\n'
+                continue
+            if payload['id'] <= last_id:
+                continue
+            last_id = payload['id']
+            yield _sse_event({'messages': [payload_for_user(payload, user)], 'last_id': last_id}, last_id)
+    finally:
+        broker.unsubscribe(chat_room_id, subscriber)
+
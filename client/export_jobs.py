@@ -0,0 +1,73 @@
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from client.exports import CLIENT_PROJECT_EXPORT
+from client.models import Project
+from core.export_jobs import export_job
+from core.exports import write_csv, write_excel
+
+
+@export_job('client_projects')
+def build_client_project_export(params, format, output, progress):
+    projects = Project.objects.filter(user=params['client_id']).order_by('id')
+
+    if format == 'xlsx':
+        return write_excel(CLIENT_PROJECT_EXPORT, projects, output, 'Projects', progress)
+    if format == 'csv':
+        return write_csv(CLIENT_PROJECT_EXPORT, projects, output, progress)
+
+    # Same columns as the spreadsheet export, minus the id and with a serial number
+    project_data = []
+    for index, row in enumerate(CLIENT_PROJECT_EXPORT.rows(projects, progress=progress), start=1):
+        project_id, title, freelancer_name, description, status, budget, total = row
+        project_data.append([str(index), title, freelancer_name, description, status, f"{budget}", f"{total}"])
+
+    # Create a PDF document using ReportLab
+    doc = SimpleDocTemplate(output, pagesize=A4)
+
+    # Define styles for the document
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading1']
+    body_style = styles['BodyText']
+
+    # Create the title
+    story = [Paragraph("Projects Report", title_style)]
+
+    # Define table data with Paragraphs to allow wrapping
+    table_data = [["#", "Title", "Freelancer", "Description", "Status", "Budget", "Total (GST)"]]
+    for project in project_data:
+        table_data.append([Paragraph(cell, body_style) for cell in project])
+
+    # Define column widths
+    column_widths = [0.5 * inch, 2 * inch, 2 * inch, 3 * inch, 1 * inch, 1 * inch, 1 * inch]
+
+    # Calculate total width
+    total_width = sum(column_widths)
+
+    # Scale down if total width exceeds usable width (7.27 inches)
+    if total_width > 7.27 * inch:
+        scale_factor = (7.27 * inch) / total_width
+        column_widths = [w * scale_factor for w in column_widths]
+
+    # Create a table with the project data and set column widths
+    table = Table(table_data, colWidths=column_widths)
+
+    # Add table styles
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),  # Header row background
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+
+    # Add the table to the story
+    story.append(table)
+
+    # Build the PDF
+    doc.build(story)
@@ -0,0 +1,24 @@
+from core.display_names import display_name_from_row, name_fields
+from core.exports import ExportSchema, register_export
+
+
+def _freelancer_name(row):
+    if row['freelancer_id'] is None:
+        return 'No freelancer assigned'
+    return display_name_from_row(row, 'freelancer__') or 'No freelancer assigned'
+
+
+CLIENT_PROJECT_EXPORT = register_export(ExportSchema(
+    name='client_projects',
+    filename='projects',
+    fields=['id', 'title', 'freelancer_id', 'description', 'project_status', 'budget', 'total_including_gst', *name_fields('freelancer__')],
+    columns=[
+        ('id', lambda row: row['id']),
+        ('title', lambda row: row['title']),
+        ('freelancer', _freelancer_name),
+        ('description', lambda row: row['description']),
+        ('status', lambda row: row['project_status']),
+        ('budget', lambda row: row['budget']),
+        ('total', lambda row: row['total_including_gst']),
+    ],
+))
@@ -0,0 +1,102 @@
+import hashlib
+import os
+from datetime import date
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template.loader import render_to_string
+from xhtml2pdf import pisa
+
+from client.models import PaymentInstallment
+from core.display_names import display_name
+
+
+INVOICE_DIR = 'invoices'
+
+
+def _link_callback(uri, rel):
+    # Lets xhtml2pdf load /static/ and /media/ files from disk
+    if uri.startswith(settings.MEDIA_URL):
+        return os.path.join(settings.MEDIA_ROOT, uri[len(settings.MEDIA_URL):])
+    if uri.startswith(settings.STATIC_URL):
+        return finders.find(uri[len(settings.STATIC_URL):]) or uri
+    return uri
+
+
+def invoice_version(contract, payments, client_name):
+    # Changes whenever anything printed on the invoice changes
+    project = contract.project
+    state = [
+        project.title, project.description, str(project.budget), str(project.total_including_gst), client_name,
+        [(payment.id, str(payment.amount), payment.status, str(payment.paid_at)) for payment in payments],
+    ]
+    return hashlib.sha256(repr(state).encode()).hexdigest()[:16]
+
+
+def invoice_path(contract_id, version):
+    return f'{INVOICE_DIR}/contract_{contract_id}_{version}.pdf'
+
+
+def remove_other_versions(contract_id, version):
+    # Deletes the contract's stored invoices of any version but `version`
+    try:
+        directories, files = default_storage.listdir(INVOICE_DIR)
+    except FileNotFoundError:
+        return
+    prefix = f'contract_{contract_id}_'
+    for name in files:
+        if name.startswith(prefix) and not name.startswith(f'{prefix}{version}'):
+            default_storage.delete(f'{INVOICE_DIR}/{name}')
+
+
+def get_invoice(contract):
+    """
+    The stored invoice PDF of the contract as (path, version), rendering it first if needed.
+
+    Rendering through xhtml2pdf is slow, so each version of an invoice is
+    rendered once and kept in storage; the version is a hash of the project
+    details, client name and installment amounts, statuses and paid dates.
+    Older versions are removed once a new one has been stored.
+    """
+    payments = list(PaymentInstallment.objects.filter(contract_id=contract.id).order_by('id'))
+    client_name = display_name(contract.client_id)
+    version = invoice_version(contract, payments, client_name)
+    path = invoice_path(contract.id, version)
+
+    if not default_storage.exists(path):
+        html_content = render_to_string('Client/InvoiceDownload.html', {
+            'project': contract.project,
+            'payments': payments,
+            'today': date.today(),
+            'client_name': client_name,
+            'pdf': True,
+        })
+        output = BytesIO()
+        pisa_status = pisa.CreatePDF(html_content, dest=output, link_callback=_link_callback)
+        if pisa_status.err:
+            raise RuntimeError(f'Could not render the invoice of contract {contract.id}')
+        path = default_storage.save(path, ContentFile(output.getvalue()))
+        remove_other_versions(contract.id, version)
+
+    return path, version
+
+
+def open_invoice(contract):
+    """
+    The invoice PDF of the contract as (open file, version, modified time).
+
+    A request rendering another version at the same moment may remove the
+    stored file between get_invoice() and reading it; it is rendered again
+    in that case.
+    """
+    for attempt in range(2):
+        path, version = get_invoice(contract)
+        try:
+            modified = default_storage.get_modified_time(path)
+            return default_storage.open(path, 'rb'), version, modified
+        except FileNotFoundError:
+            if attempt:
+                raise
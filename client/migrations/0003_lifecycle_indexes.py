@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['status', 'date_filed'], name='client_comp_status_9b81ce_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'end_date'], name='client_proj_status_a6705f_idx'),
+        ),
+    ]
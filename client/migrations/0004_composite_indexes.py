@@ -0,0 +1,35 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0003_lifecycle_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['chat_room', 'timestamp'], name='client_mess_chat_ro_8ad0d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentinstallment',
+            index=models.Index(fields=['contract', 'status', 'due_date'], name='client_paym_contrac_750ba2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentinstallment',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['due_date'], name='installment_pending_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewee', 'review_date'], name='client_revi_reviewe_9de655_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status'], name='client_task_project_f32a41_idx'),
+        ),
+    ]
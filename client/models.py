@@ -70,6 +70,9 @@ class Project(models.Model):
     
     scope = models.CharField(max_length=10, choices=SCOPE_CHOICES, default='medium')
 
+    class Meta:
+        indexes = [models.Index(fields=['status', 'end_date'])]  # core.lifecycle expiry sweep
+
     def save(self, *args, **kwargs):
         
         if isinstance(self.budget, str):
@@ -139,6 +142,9 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     progress_percentage = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [models.Index(fields=['project', 'status'])]
     
     def save(self, *args, **kwargs):
         if self.start_date and self.start_date == timezone.now().date():
@@ -180,6 +186,14 @@ class PaymentInstallment(models.Model):
     razorpay_order_id = models.CharField(max_length=255, null=True, blank=True)
     razorpay_payment_id = models.CharField(max_length=255, null=True, blank=True)
     paid_at=models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['contract', 'status', 'due_date']),
+            # Pending installments by due date, for reminders
+            models.Index(fields=['due_date'], condition=models.Q(status='pending'), name='installment_pending_due_idx'),
+        ]
+
     def __str__(self):
         return f'Installment {self.id} for Contract {self.contract.id}'
     
@@ -225,6 +239,9 @@ class Review(models.Model):
         default=0
     )
     review_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['reviewee', 'review_date'])]
     
     
     
@@ -255,6 +272,9 @@ class Message(models.Model):
     
     # Timestamp for the message
     timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['chat_room', 'timestamp'])]
     
     def __str__(self):
         return f"Message from {self.sender.username} in {self.chat_room} at {self.timestamp}"
@@ -295,16 +315,15 @@ class Complaint(models.Model):
     resolution_status = models.CharField(max_length=15, choices=RESOLUTION_STATUS_CHOICES, null=True, blank=True, default='Pending')
     resolution_date = models.DateTimeField(null=True, blank=True)  # New field for resolution date
 
+    class Meta:
+        indexes = [models.Index(fields=['status', 'date_filed'])]  # core.lifecycle rejection sweep
+
     def save(self, *args, **kwargs):
         # Check if the complaint is resolved and set the resolution date
         if self.status == 'Resolved' and not self.resolution_date:
             self.resolution_date = timezone.now()
-        
-        # Automatically reject if not resolved within 30 days
-        if self.date_filed and self.status != 'Resolved':
-            if timezone.now() > self.date_filed + timezone.timedelta(days=30):
-                self.status = 'Rejected'
-        
+
+        # Complaints pending for 30 days are rejected by core.lifecycle
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -0,0 +1,43 @@
+from django.db.models import Count, Q
+
+from client.models import Project
+from core.display_names import display_names
+
+
+def project_progress(projects):
+    """
+    Task progress of the given projects in a single query.
+
+    Each row carries the total and completed task counts and the client
+    display name (from core.display_names). Projects whose tasks are all completed are marked
+    'Completed' with one bulk UPDATE.
+    """
+    projects = list(projects.select_related('freelancer').annotate(
+        total_tasks=Count('task'),
+        completed_tasks=Count('task', filter=Q(task__status='Completed')),
+    ))
+    client_names = display_names(project.user_id for project in projects)
+
+    project_progress_data = []
+    newly_completed = []
+    for project in projects:
+        total_tasks = project.total_tasks
+        completed_tasks = project.completed_tasks
+        progress_percentage = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0.0
+
+        if progress_percentage == 100 and project.project_status != 'Completed':
+            project.project_status = 'Completed'
+            newly_completed.append(project.id)
+
+        project_progress_data.append({
+            'project': project,
+            'progress_percentage': progress_percentage,
+            'total_tasks': total_tasks,
+            'completed_tasks': completed_tasks,
+            'client_name': client_names.get(project.user_id),
+        })
+
+    if newly_completed:
+        Project.objects.filter(id__in=newly_completed).update(project_status='Completed')
+
+    return project_progress_data
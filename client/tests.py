@@ -1,7 +1,50 @@
+import datetime
+from unittest import mock
 
-from django.test import TestCase
+from client import views
+from client.models import Complaint, Message, PaymentInstallment, Project, Review, Task
+from core.middleware import QueryBudgetExceeded
+from core.tests import QueryBudgetTestCase, QueryPlanTestCase
 
 
-from django.test import TestCase
+class ClientQueryPlanTests(QueryPlanTestCase):
+    def test_chat_messages_since(self):
+        self.assertIndexed(Message.objects.filter(chat_room_id=1, timestamp__gt=datetime.datetime(2024, 1, 1)).order_by('timestamp'))
 
+    def test_project_tasks_by_status(self):
+        self.assertIndexed(Task.objects.filter(project_id=1, status='Completed'))
 
+    def test_pending_installments_of_contract(self):
+        self.assertIndexed(PaymentInstallment.objects.filter(contract_id=1, status='pending').order_by('due_date'))
+
+    def test_installments_due_soon(self):
+        # core.reminders
+        today = datetime.date(2024, 1, 1)
+        self.assertIndexed(
+            PaymentInstallment.objects.filter(status='pending', due_date__range=[today, today + datetime.timedelta(days=1)]),
+            'installment_pending_due_idx',
+        )
+
+    def test_reviews_received(self):
+        self.assertIndexed(Review.objects.filter(reviewee_id=1).order_by('-review_date'))
+
+    def test_expired_projects(self):
+        # core.lifecycle
+        self.assertIndexed(Project.objects.filter(status='open', end_date__lt=datetime.date(2024, 1, 1)))
+
+    def test_stale_complaints(self):
+        self.assertIndexed(Complaint.objects.filter(status='Pending', date_filed__lt=datetime.datetime(2024, 1, 1)))
+
+
+class ClientQueryBudgetTests(QueryBudgetTestCase):
+    def test_client_view(self):
+        self.get('client0', '/client/client_view/')
+
+    def test_export_projects(self):
+        self.get('client0', '/client/export_projects_excel/')
+        self.get('client0', '/client/export_projects_excel/?format=csv')
+
+    def test_over_budget_raises(self):
+        with mock.patch.object(views.client_view, 'query_budget', 1):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.get('client0', '/client/client_view/')
@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.shortcuts import render
 from django.urls import include, path
 
-from client.views import  download_invoice,view_invoice,payments,export_projects_excel,export_projects_pdf,update_complaint_status,update_solution,view_complaints_recieved,view_complaints,add_complaint,send_file,fetch_messages,send_message,chat_view,add_github_link,edit_task, submit_review, update_task_status, verify_payment,payment_success,make_payment, submit_contract,add_task, add_url,add_note,add_file, create_repository,acc_deactivate,lock_proposal, notification_mark_as_read, toggle_project_status,edit_project,delete_event,update_event,add_event,update_proposal_status,freelancer_detail,calendar,AddProfileClient, client_view,account_settings,change_password, project_list, single_project_view,update_profile,change_profile_image,add_new_project,freelancer_list, update_task_progress, view_repository
+from client.views import  chat_stream,download_invoice,view_invoice,payments,export_projects_excel,export_projects_pdf,update_complaint_status,update_solution,view_complaints_recieved,view_complaints,add_complaint,send_file,fetch_messages,send_message,chat_view,add_github_link,edit_task, submit_review, update_task_status, verify_payment,payment_success,make_payment, submit_contract,add_task, add_url,add_note,add_file, create_repository,acc_deactivate,lock_proposal, notification_mark_as_read, toggle_project_status,edit_project,delete_event,update_event,add_event,update_proposal_status,freelancer_detail,calendar,AddProfileClient, client_view,account_settings,change_password, project_list, single_project_view,update_profile,change_profile_image,add_new_project,freelancer_list, update_task_progress, view_repository
 
 def welcome(request):
     return render(request,'welcome.html')
@@ -74,6 +74,7 @@ urlpatterns = [
     path('chat_view/', chat_view, name='chat_view'),
     path('send-message/', send_message, name='send_message'),
     path('fetch-messages/', fetch_messages, name='fetch_messages'),
+    path('chat-stream/<int:chat_room_id>/', chat_stream, name='chat_stream'),
     path('send_file/', send_file, name='send_file'),
     
     
@@ -7,7 +7,13 @@ from django.shortcuts import redirect, render
 import razorpay
 
 from client.models import ClientProfile, FreelanceContract, PaymentInstallment, Project, Review, SharedFile, SharedNote, SharedURL, Task, ChatRoom, Message,Complaint  # Add Message here
-from core.decorators import nocache
+from client.progress import project_progress
+from django.core.paginator import Paginator
+from freelancer.search import search_freelancers
+from client.chat import fetch_room_messages, publish_message, stream_room_messages
+from core.decorators import nocache, query_budget
+from core.viewer import get_viewer
+from core.display_names import display_name, display_names
 from core.models import CustomUser, Event, Notification, Register
 
 from django.contrib.auth.decorators import login_required
@@ -30,6 +36,7 @@ from datetime import date
 
 @login_required
 @nocache
+@query_budget(30)
 def client_view(request):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
@@ -40,72 +47,24 @@ def client_view(request):
 
     events = Event.objects.filter(user=logged_user, start_time__range=[current_date, one_week_later])
 
-    profile1 = CustomUser.objects.get(id=logged_user.id)
-    profile2 = Register.objects.get(user_id=logged_user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     
     client, created = ClientProfile.objects.get_or_create(user_id=logged_user.id)
     notifications = Notification.objects.filter(user=logged_user).order_by('-created_at')[:5]
 
-    for event in events:
-        one_day_before = event.start_time.date() - datetime.timedelta(days=1)
-        if one_day_before == current_date:
-            Notification.objects.get_or_create(
-                user=logged_user,
-                message=f"Reminder: Upcoming event '{event.title}' tomorrow!",
-                defaults={'is_read': False}
-            )
-        if event.start_time.date() == current_date:
-            Notification.objects.get_or_create(
-                user=logged_user,
-                message=f"Reminder: Event '{event.title}' is today!",
-                defaults={'is_read': False}
-            )
-
-    client_projects = Project.objects.filter(user=logged_user)
-    project_progress_data = []
-
-    # Project progress data
-    for project in client_projects:
-        tasks = Task.objects.filter(project=project)
-        total_tasks = tasks.count()
-        completed_tasks = tasks.filter(status='Completed').count()
-        progress_percentage = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0.0
-
-        if progress_percentage == 100:
-            project.project_status = 'Completed'
-            project.save()
-            
-        project_progress_data.append({
-            'project': project,
-            'progress_percentage': progress_percentage,
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks
-        })
+    # Task counts for every project come from one annotated query
+    project_progress_data = project_progress(Project.objects.filter(user=logged_user))
 
-    total_projects = client_projects.count()
-    completed_projects = client_projects.filter(project_status='Completed').count()
+    total_projects = len(project_progress_data)
+    completed_projects = sum(1 for data in project_progress_data if data['project'].project_status == 'Completed')
     not_completed_projects = total_projects - completed_projects
     
     client_contracts = FreelanceContract.objects.filter(client=logged_user).select_related('freelancer', 'project')
     payment_installments = PaymentInstallment.objects.filter(contract__in=client_contracts).select_related('contract__project', 'contract__freelancer')
 
-    for installment in payment_installments:
-        due_date = installment.due_date
-        one_day_before_due = due_date - datetime.timedelta(days=1)
-        
-        if installment.status == 'Pending':
-            if one_day_before_due == current_date:
-                Notification.objects.get_or_create(
-                    user=logged_user,
-                    message=f"Reminder: Payment installment for project '{installment.contract.project.title}' is due tomorrow!",
-                    defaults={'is_read': False}
-                )
-            elif due_date == current_date:
-                Notification.objects.get_or_create(
-                    user=logged_user,
-                    message=f"Reminder: Payment installment for project '{installment.contract.project.title}' is due today!",
-                    defaults={'is_read': False}
-                )
+    # Event and installment reminders are created by the send_reminders management command
 
     if not profile2.phone_number and not profile2.profile_picture and not profile2.bio_description and not profile2.location:
         return render(request, 'Client/Add_profile.html', {
@@ -447,9 +406,10 @@ def make_payment(request, installment_id):
         return redirect('login')
 
     uid = request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         if request.method == 'POST':
@@ -621,9 +581,10 @@ def update_profile(request, uid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
 
     if request.method == 'POST':
         # Fetch POST data
@@ -678,9 +639,10 @@ def account_settings(request):
     if 'uid' not in request.session and not request.user.is_authenticated and request.user.role!='client':
         return redirect('login')
     uid=request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    client=ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     return render(request, 'Client/profile.html',{'profile1':profile1,'profile2':profile2,'client':client})
 
@@ -695,9 +657,10 @@ def change_password(request, uid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    client=ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
 
     if request.method == 'POST':
         current = request.POST.get('current_password')
@@ -730,9 +693,10 @@ def change_profile_image(request,uid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    client=ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if request.method=='POST':
         
@@ -744,37 +708,6 @@ def change_profile_image(request,uid):
             return redirect('client:account_settings')
     return render(request, 'Client/profile.html',{'profile1':profile1,'profile2':profile2,'client':client})
 
-@login_required
-@nocache
-def download_invoice(request, contract_id):
-    # Fetch the contract using the contract_id
-    contract = get_object_or_404(FreelanceContract, id=contract_id)
-    
-    # Fetch related project and payment details
-    project = contract.project
-    payments = PaymentInstallment.objects.filter(contract_id=contract_id)
-    today = date.today()  # Get today's date
-
-    # Render the HTML template with context
-    html_content = render_to_string('Client/InvoiceDownload.html', {
-        'project': project,
-        'payments': payments,
-        'today': today
-    })
-
-    # Create a PDF response
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="invoice_{contract_id}.pdf"'
-
-    # Convert HTML to PDF
-    pisa_status = pisa.CreatePDF(
-       html_content, dest=response
-    )
-
-    # Return the response
-    if pisa_status.err:
-       return HttpResponse('We had some errors <pre>' + html_content + '</pre>')
-    return response
 
 
         
@@ -785,8 +718,9 @@ def freelancer_list(request):
         return redirect('login')
 
     uid = request.session.get('uid', request.user.id)
-    profile1 = get_object_or_404(CustomUser, id=uid)
-    profile2 = get_object_or_404(Register, user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=uid)
 
     if profile1.permission:
@@ -794,48 +728,20 @@ def freelancer_list(request):
         profession_filter = request.GET.get('profession', '')
         skill_filter = request.GET.get('skill', '')
 
-        users_with_profiles = CustomUser.objects.filter(
-            role='freelancer',
-            freelancerprofile__professional_title__isnull=False
-        ).exclude(
-            freelancerprofile__professional_title__exact=''
-        ).select_related('freelancerprofile', 'register')
-
-        if search_query:
-            users_with_profiles = users_with_profiles.filter(
-                Q(username__icontains=search_query) |
-                Q(freelancerprofile__professional_title__icontains=search_query) |
-                Q(register__first_name__icontains=search_query) |
-                Q(register__last_name__icontains=search_query)
-            )
-
-        if profession_filter:
-            users_with_profiles = users_with_profiles.filter(
-                freelancerprofile__professional_title__icontains=profession_filter
-            )
-
-        if skill_filter:
-            users_with_profiles = users_with_profiles.filter(
-                freelancerprofile__skills__icontains=skill_filter
-            )
-
-        registers = Register.objects.all()
-        register_dict = {}
-        for reg in registers:
-            register_dict.setdefault(reg.user_id, []).append(reg)
+        # Ranked lookup on the freelancer search index (see freelancer.search)
+        profiles = search_freelancers(search_query, profession_filter, skill_filter)
+        page_obj = Paginator(profiles, 12).get_page(request.GET.get('page'))
 
         context = []
-        for user in users_with_profiles:
-            freelancer_profile = getattr(user, 'freelancerprofile', None)
-            professions = freelancer_profile.professional_title.strip('[]').replace("'", "").split(', ') if freelancer_profile and freelancer_profile.professional_title else []
-            skills = freelancer_profile.skills.strip('[]').replace("'", "").split(', ') if freelancer_profile and freelancer_profile.skills else []
-
+        for freelancer_profile in page_obj:
+            user = freelancer_profile.user
+            register = getattr(user, 'register', None)
             context.append({
                 'user': user,
                 'freelancer_profile': freelancer_profile,
-                'registers': register_dict.get(user.id, []),
-                'professions': [title.strip() for title in professions],
-                'skills': [skill.strip() for skill in skills]
+                'registers': [register] if register else [],
+                'professions': [profession.name for profession in freelancer_profile.profession_tags.all()],
+                'skills': [skill.name for skill in freelancer_profile.skill_tags.all()]
             })
 
         profession_choices = [
@@ -858,6 +764,7 @@ def freelancer_list(request):
             'profile2': profile2,
             'client': client,
             'users': context,
+            'page_obj': page_obj,
             'search_query': search_query,
             'profession_filter': profession_filter,
             'skill_filter': skill_filter,
@@ -881,27 +788,26 @@ def freelancer_detail(request, fid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         profile3 = CustomUser.objects.get(id=fid)
         profile4 = Register.objects.get(user_id=fid)
         freelancer = FreelancerProfile.objects.get(user_id=fid)
         
-        skills_list = [skill.strip() for skill in freelancer.skills.strip('[]').replace("'", "").split(',')]
+        skills_list = [skill.name for skill in freelancer.skill_tags.all()]
         
-        reviews = Review.objects.filter(reviewee=profile3).order_by('-review_date')
+        reviews = Review.objects.filter(reviewee=profile3).select_related('reviewer__register').order_by('-review_date')
+
+        reviewer_names = display_names(review.reviewer_id for review in reviews)
 
         review_details = []
         for review in reviews:
-            reviewer_profile = Register.objects.get(user_id=review.reviewer.id)
-            
-            if review.reviewer.clientprofile.client_type == 'Individual':
-                reviewer_name = reviewer_profile.first_name + ' ' + reviewer_profile.last_name
-            else:
-                reviewer_name = review.reviewer.clientprofile.company_name
+            reviewer_profile = review.reviewer.register
+            reviewer_name = reviewer_names.get(review.reviewer_id)
             
             review_details.append({
                 'review': review,
@@ -937,9 +843,10 @@ def calendar(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     events = Event.objects.filter(user=uid)
     events_data = [
         {
@@ -980,9 +887,10 @@ def add_event(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    client=ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     if profile1.permission==True:
         if request.method == 'POST':
             title = request.POST.get('title')
@@ -1014,8 +922,9 @@ def update_event(request):
         return redirect('login')
 
     uid = request.session.get('uid')
-    profile1 = get_object_or_404(CustomUser, id=uid)
-    profile2 = get_object_or_404(Register, user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=uid)
 
     if profile1.permission:
@@ -1075,8 +984,9 @@ def delete_event(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = get_object_or_404(CustomUser, id=uid)
-    profile2 = get_object_or_404(Register, user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=uid)
 
     if profile1.permission:
@@ -1109,9 +1019,10 @@ def add_new_project(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     categories = [
         "Web Development", "Front-End Development", "Back-End Development", "Full-Stack Development", "Mobile Development",
@@ -1185,9 +1096,10 @@ def edit_project(request, pid):
         return redirect('login')
 
     uid = request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     categories = [
         "Web Development", "Front-End Development", "Back-End Development", "Full-Stack Development", "Mobile Development",
         "Android Development", "iOS Development", "UI/UX Design",
@@ -1246,9 +1158,10 @@ def project_list(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     if profile1.permission:
         search_query = request.GET.get('search', '')
         if search_query:
@@ -1298,19 +1211,17 @@ def single_project_view(request,pid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    client=ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     if profile1.permission:
         project = get_object_or_404(Project, id=pid)
         proposals = Proposal.objects.filter(project_id=project)
         
         freelancer_ids = proposals.values_list('freelancer__id', flat=True)
         reg_details = Register.objects.filter(user_id__in=freelancer_ids)
-        freelancer_profiles = FreelancerProfile.objects.filter(user_id__in=freelancer_ids)
-        
-        for profile in freelancer_profiles:
-            profile.skills = profile.skills.strip('[]').replace("'", "").split(', ')
+        freelancer_profiles = FreelancerProfile.objects.filter(user_id__in=freelancer_ids).prefetch_related('skill_tags')
         
         additional_files = ProposalFile.objects.filter(proposal__in=proposals)
 
@@ -1453,17 +1364,7 @@ def acc_deactivate(request):
     user.save()
     subject = 'Account Deactivation Notice'
     
-    client_profile = ClientProfile.objects.get(user_id=uid)
-    if client_profile.client_type == 'Individual':
-        
-        register_info = Register.objects.get(user_id=uid)
-        first_name = register_info.first_name
-        last_name = register_info.last_name
-        name = f"{first_name} {last_name}"
-    else:  
-        
-        company_name = client_profile.company_name
-        name = company_name
+    name = display_name(uid)
     context = {
         'user_name': name
     }
@@ -1486,9 +1387,10 @@ def create_repository(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         if request.method == 'POST':
@@ -1524,37 +1426,6 @@ def create_repository(request):
             'client': client,
         })
 
-@login_required
-@nocache
-def download_invoice(request, contract_id):
-    # Fetch the contract using the contract_id
-    contract = get_object_or_404(FreelanceContract, id=contract_id)
-    
-    # Fetch related project and payment details
-    project = contract.project
-    payments = PaymentInstallment.objects.filter(contract_id=contract_id)
-    today = date.today()  # Get today's date
-
-    # Render the HTML template with context
-    html_content = render_to_string('Client/InvoiceDownload.html', {
-        'project': project,
-        'payments': payments,
-        'today': today
-    })
-
-    # Create a PDF response
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="invoice_{contract_id}.pdf"'
-
-    # Convert HTML to PDF
-    pisa_status = pisa.CreatePDF(
-       html_content, dest=response
-    )
-
-    # Return the response
-    if pisa_status.err:
-       return HttpResponse('We had some errors <pre>' + html_content + '</pre>')
-    return response
         
 from core.models import CancellationRequest
 @login_required
@@ -1564,9 +1435,10 @@ def view_repository(request, repo_id):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1652,9 +1524,10 @@ def add_github_link(request,repo_id):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1690,9 +1563,10 @@ def add_file(request,repo_id):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1727,9 +1601,10 @@ def add_url(request,repo_id):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = ClientProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1765,9 +1640,10 @@ def add_note(request, repo_id):
         return redirect('login')
 
     # Fetch user profiles
-    profile1 = CustomUser.objects.get(id=request.user.id)
-    profile2 = Register.objects.get(user_id=request.user.id)
-    client = ClientProfile.objects.get(user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1804,9 +1680,10 @@ def add_task(request, repo_id):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=request.user.id)
-    profile2 = Register.objects.get(user_id=request.user.id)
-    client = ClientProfile.objects.get(user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1843,9 +1720,10 @@ def update_task_progress(request, repo_id):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=request.user.id)
-    profile2 = Register.objects.get(user_id=request.user.id)
-    client = ClientProfile.objects.get(user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         if request.method == "POST":
@@ -1890,9 +1768,10 @@ def update_task_status(request, repo_id):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=request.user.id)
-    profile2 = Register.objects.get(user_id=request.user.id)
-    client = ClientProfile.objects.get(user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         if request.method == "POST":
@@ -1929,9 +1808,10 @@ def edit_task(request, repo_id):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=request.user.id)
-    profile2 = Register.objects.get(user_id=request.user.id)
-    client = ClientProfile.objects.get(user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.client
     
     if profile1.permission:
         if request.method == "POST":
@@ -1969,8 +1849,9 @@ def submit_contract(request, pro_id):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=request.user.id)
-    profile2 = get_object_or_404(Register, user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=request.user.id)
     
     if profile1.permission:
@@ -2072,8 +1953,9 @@ def chat_view(request):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=request.user.id)
-    profile2 = get_object_or_404(Register, user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=request.user.id)
     
     if profile1.permission:
@@ -2134,6 +2016,7 @@ def send_message(request):
                 content=content,
                 sender=request.user
             )
+            publish_message(message)
 
             return JsonResponse({'success': True, 'message': message.content, 'sender': message.sender.username, 'timestamp': message.timestamp.isoformat()}, status=200)
         except Exception as e:
@@ -2147,27 +2030,52 @@ def fetch_messages(request):
         data = json.loads(request.body)
         chat_room_id = data.get('chat_room_id')
 
-        # Fetch messages for the given chat room
-        messages = Message.objects.filter(chat_room_id=chat_room_id).order_by('timestamp')
+        # Only messages newer than the client's last seen message are returned
+        try:
+            after_id = int(data.get('after_id') or 0)
+        except (TypeError, ValueError):
+            after_id = 0
 
-        # Prepare messages for response
-        messages_list = []
-        for message in messages:
-            print(f"Message ID: {message.id}, Content: {message.content}, Image: {message.image}, File: {message.file}")  # Debugging line
+        messages_list, last_id = fetch_room_messages(
+            chat_room_id, request.user, after_id=after_id, since=data.get('since')
+        )
 
-            msg_data = {
-                'content': message.content if message.content else '',  # Ensure content is not None
-                'type': 'sent' if message.sender == request.user else 'received',
-                'image': message.image.url if message.image and hasattr(message.image, 'url') else None,  # Check if image exists
-                'file': message.file.url if message.file and hasattr(message.file, 'url') else None,    # Check if file exists
-            }
-            messages_list.append(msg_data)
+        return JsonResponse({'success': True, 'messages': messages_list, 'last_id': last_id})
 
-        print(messages_list)  # Debugging line to check the messages list
+    return JsonResponse({'success': False, 'error': 'Invalid request method.'})
 
-        return JsonResponse({'success': True, 'messages': messages_list})
 
-    return JsonResponse({'success': False, 'error': 'Invalid request method.'})
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseForbidden, StreamingHttpResponse
+
+async def chat_stream(request, chat_room_id):
+    # Server-Sent Events stream of a chat room. The first event carries the messages after the
+    # client's cursor (after_id, or the Last-Event-ID header EventSource sends on reconnect);
+    # later events are pushed as soon as a participant sends something.
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be held for the lifetime of the stream; 204 tells EventSource
+        # to stop reconnecting and the page falls back to polling fetch_messages
+        return HttpResponse(status=204)
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponseForbidden()
+
+    if not await ChatRoom.objects.filter(id=chat_room_id, participants=user).aexists():
+        return HttpResponseForbidden()
+
+    try:
+        after_id = int(request.headers.get('Last-Event-ID') or request.GET.get('after_id') or 0)
+    except ValueError:
+        after_id = 0
+
+    response = StreamingHttpResponse(
+        stream_room_messages(chat_room_id, user, after_id),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 
@@ -2199,6 +2107,7 @@ def send_file(request):
                 )
 
             message.save()  # Save the message with the file
+            publish_message(message)
 
             return JsonResponse({'success': True, 'message': 'File uploaded successfully.'})
         except Exception as e:
@@ -2215,8 +2124,9 @@ def add_complaint(request):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=request.user.id)
-    profile2 = get_object_or_404(Register, user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=request.user.id)
     
     if profile1.permission:
@@ -2291,8 +2201,9 @@ def view_complaints(request):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=request.user.id)
-    profile2 = get_object_or_404(Register, user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=request.user.id)
     
     if profile1.permission:
@@ -2315,8 +2226,9 @@ def view_complaints_recieved(request):
     if not request.user.is_authenticated or request.user.role != 'client':
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=request.user.id)
-    profile2 = get_object_or_404(Register, user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     client = get_object_or_404(ClientProfile, user_id=request.user.id)
     
     if profile1.permission:
@@ -2391,123 +2303,24 @@ def update_complaint_status(request):
     return JsonResponse({'success': False, 'error': 'Invalid request.'})
 
 
-from django.http import HttpResponse
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+from core.export_jobs import export_job_response
 
+@login_required
+@query_budget(15)
 def export_projects_pdf(request):
-    user_id = request.user.id  # Get the logged-in user's ID
-    projects = Project.objects.filter(user=user_id).select_related('freelancer')  # Get the projects
-
-    project_data = []
-    for index, project in enumerate(projects, start=1):  # Use enumerate for serial numbers
-        freelancer_name = 'No freelancer assigned'
-        if project.freelancer:
-            register = Register.objects.filter(user=project.freelancer).values('first_name', 'last_name').first()
-            if register:
-                freelancer_name = f"{register['first_name']} {register['last_name']}"
-
-        project_data.append([
-            str(index),  # Serial number
-            project.title,
-            freelancer_name,
-            project.description,
-            project.project_status,
-            f"{project.budget}",
-            f"{project.total_including_gst}",
-        ])
-
-    # Set up response for PDF file
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="projects_report.pdf"'
-
-    # Create a PDF document using ReportLab
-    doc = SimpleDocTemplate(response, pagesize=A4)
-
-    # Define styles for the document
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    body_style = styles['BodyText']
-
-    # Create the title
-    story = [Paragraph("Projects Report", title_style)]
-
-    # Define table data with Paragraphs to allow wrapping
-    table_data = [["#", "Title", "Freelancer", "Description", "Status", "Budget", "Total (GST)"]]
-    for project in project_data:
-        table_data.append([Paragraph(cell, body_style) for cell in project])
-
-    # Define column widths
-    column_widths = [0.5 * inch, 2 * inch, 2 * inch, 3 * inch, 1 * inch, 1 * inch, 1 * inch]
-
-    # Calculate total width
-    total_width = sum(column_widths)
-
-    # Scale down if total width exceeds usable width (7.27 inches)
-    if total_width > 7.27 * inch:
-        scale_factor = (7.27 * inch) / total_width
-        column_widths = [w * scale_factor for w in column_widths]
-
-    # Create a table with the project data and set column widths
-    table = Table(table_data, colWidths=column_widths)
-
-    # Add table styles
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),  # Header row background
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-
-    # Add the table to the story
-    story.append(table)
-
-    # Build the PDF
-    doc.build(story)
-
-    # Return the response with the generated PDF
-    return response
+    # Built by the export worker (client.export_jobs); the page polls until the file is ready
+    return export_job_response(request, 'client_projects', 'pdf', {'client_id': request.user.id}, 'projects_report.pdf')
 
 
 
 
+from client.exports import CLIENT_PROJECT_EXPORT
+from core.exports import export_response
 
+@query_budget(15)
 def export_projects_excel(request):
-    user_id = request.user.id  # Get the logged-in user's ID
-    projects = Project.objects.filter(user=user_id).select_related('freelancer')  # Get the projects directly
-
-    # Prepare data for exporting
-    data = []
-    for project in projects:
-        freelancer_name = 'No freelancer assigned'
-        if project.freelancer:  # Accessing the actual model instance
-            register = Register.objects.filter(user=project.freelancer).values('first_name', 'last_name').first()
-            if register:
-                freelancer_name = f"{register['first_name']} {register['last_name']}"
-
-        data.append({
-            'id': project.id,
-            'title': project.title,
-            'freelancer': freelancer_name,
-            'description': project.description,
-            'status': project.project_status,  # Adding project_status
-            'budget': project.budget,  # Adding budget
-            'total': project.total_including_gst,  # Adding total_including_gst
-        })
-
-    df = pd.DataFrame(data)  # Create a DataFrame
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="projects.xlsx"'
-    
-    df.to_excel(response, index=False)  # Write DataFrame to response
-    return response
+    projects = Project.objects.filter(user=request.user.id).order_by('id')  # Projects of the logged-in client
+    return export_response(request, CLIENT_PROJECT_EXPORT, projects)
 
 
 @login_required
@@ -2571,26 +2384,33 @@ from django.shortcuts import get_object_or_404
 from client.models import FreelanceContract, PaymentInstallment
 from datetime import date
 
+from django.db.models import Q
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from client.invoices import open_invoice
+
 @login_required
-@nocache
 def download_invoice(request, contract_id):
-    # Fetch the contract using the contract_id
-    contract = get_object_or_404(FreelanceContract, id=contract_id)
-    
-    project = contract.project
-    payments = PaymentInstallment.objects.filter(contract_id=contract_id)
-    today = date.today()  # Get today's date
+    # Only the two parties of the contract can download its invoice
+    contract = get_object_or_404(
+        FreelanceContract.objects.select_related('project'),
+        Q(client=request.user) | Q(freelancer=request.user),
+        id=contract_id,
+    )
 
-    client_profile = ClientProfile.objects.get(user=request.user.id)
-    if client_profile.client_type == 'Individual':
-        register_info = Register.objects.get(user=request.user.id)
-        client_name = f"{register_info.first_name} {register_info.last_name}"
-    else:
-        client_name = client_profile.company_name
+    # The PDF is rendered once per invoice version (client.invoices) and revalidated by ETag
+    pdf, version, modified = open_invoice(contract)
+    etag = f'"{contract.id}-{version}"'
+    last_modified = int(modified.timestamp())
 
-    return render(request, 'Client/InvoiceDownload.html', {
-        'project': project,
-        'payments': payments,
-        'today': today,
-        'client_name': client_name  
-    })
\ No newline at end of file
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(pdf, as_attachment=True,
+                                filename=f'invoice_{contract.id}.pdf', content_type='application/pdf')
+    else:
+        pdf.close()
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
\ No newline at end of file
@@ -0,0 +1,149 @@
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from client.models import ChatRoom
+from core.models import CustomUser
+from core.synthetic import EMAIL_DOMAIN
+
+
+class Scenario:
+    """One request to benchmark: made as `user` (an email) with the Django test client."""
+
+    def __init__(self, name, user, path, method='get', data=None, content_type=None):
+        self.name = name
+        self.user = user
+        self.path = path
+        self.method = method
+        self.data = data
+        self.content_type = content_type
+
+
+def default_scenarios():
+    # The hot views, as seen by the first generated client, freelancer and the admin
+    client = f'client0@{EMAIL_DOMAIN}'
+    freelancer = f'freelancer0@{EMAIL_DOMAIN}'
+    admin = f'admin0@{EMAIL_DOMAIN}'
+    room = ChatRoom.objects.filter(participants__email=client).order_by('id').first()
+    scenarios = [
+        Scenario('client_view', client, '/client/client_view/'),
+        Scenario('freelancer_view', freelancer, '/freelancer/freelancer_view/'),
+        Scenario('freelancer_list', client, '/client/freelancer_list/'),
+        Scenario('view_project', freelancer, '/freelancer/view_project/'),
+        Scenario('admin_view', admin, '/administrator/admin_view/'),
+        Scenario('allusers', admin, '/administrator/allusers/'),
+        Scenario('export_users_xlsx', admin, '/administrator/export_users/?format=excel'),
+        Scenario('export_projects_xlsx', admin, '/administrator/export_projects_excel/'),
+        Scenario('export_complaints_xlsx', admin, '/administrator/export_complaints_excel/'),
+        Scenario('client_export_projects_xlsx', client, '/client/export_projects_excel/'),
+    ]
+    if room:
+        scenarios.append(Scenario(
+            'fetch_messages', client, '/client/fetch-messages/', method='post',
+            data=json.dumps({'chat_room_id': room.id}), content_type='application/json',
+        ))
+    return scenarios
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class ScenarioFailed(Exception):
+    """The view answered with something other than 200, so its timings would measure an error page."""
+
+
+def _request(client, scenario):
+    kwargs = {'content_type': scenario.content_type} if scenario.content_type else {}
+    response = getattr(client, scenario.method)(scenario.path, scenario.data, **kwargs)
+    if response.status_code != 200:
+        error = getattr(response, 'exc_info', None)
+        detail = f': {error[0].__name__}: {error[1]}' if error else ''
+        raise ScenarioFailed(f'{scenario.path} returned {response.status_code}{detail}')
+    # Streamed bodies (CSV/Excel exports) are produced while they are read
+    if response.streaming:
+        b''.join(response.streaming_content)
+    else:
+        response.content
+    return response
+
+
+def run_scenario(scenario, iterations=20, warmup=2):
+    """
+    Latency percentiles (ms), queries and peak Python memory of one scenario.
+
+    Timed requests run without tracemalloc; peak memory is measured on one
+    extra request afterwards. Raises ScenarioFailed on any response other
+    than 200.
+    """
+    # A view that raises shows up as a 500 and fails the scenario instead of the whole run
+    client = Client(raise_request_exception=False)
+    user = CustomUser.objects.get(email=scenario.user)
+    client.force_login(user)
+    session = client.session
+    session['uid'] = user.id
+    session.save()
+
+    for _ in range(warmup):
+        _request(client, scenario)
+
+    timings, queries = [], []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = _request(client, scenario)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+
+    tracemalloc.start()
+    try:
+        _request(client, scenario)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'status': response.status_code,
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(scenarios=None, iterations=20, warmup=2, only=None):
+    # Failed scenarios are kept in the results as {'error': ...} without any metrics
+    results = {}
+    for scenario in scenarios or default_scenarios():
+        if only and scenario.name not in only:
+            continue
+        try:
+            results[scenario.name] = run_scenario(scenario, iterations, warmup)
+        except ScenarioFailed as e:
+            results[scenario.name] = {'error': str(e)}
+    return results
+
+
+def compare(results, baseline):
+    # Rows of (scenario, metric, baseline, current, change %) for metrics found in both runs
+    rows = []
+    for name, metrics in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'queries', 'peak_memory_kb'):
+            before, after = previous.get(metric), metrics.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else 0.0
+            rows.append((name, metric, before, after, round(change, 1)))
+    return rows
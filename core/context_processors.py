@@ -2,10 +2,12 @@ from client.models import Repository
 from core.decorators import nocache
 from core.models import CustomUser, Notification, Register, SiteReview
 from client.models import Project
+from core.viewer import get_viewer
 
 def unread_notifications(request):
-    if request.user.is_authenticated:
-        unread_notifications = Notification.objects.filter(user=request.user, is_read=False)
+    viewer = get_viewer(request)
+    if viewer:
+        unread_notifications = viewer.unread_notifications
     else:
         unread_notifications = []
     return {'unread_notifications': unread_notifications}
@@ -26,34 +28,44 @@ def repository_list(request):
 
 
 
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from client.models import Project, ClientProfile
 
 from django.contrib.auth.decorators import login_required
 def project_status(request):
     context = {}
-    current_user = request.user
-    
-    completed_projects = Project.objects.filter(
-        project_status='Completed',
-        freelancer=current_user.id
-    ) | Project.objects.filter(
-        project_status='Completed',
-        user=current_user.id
-    )
-
-    if completed_projects.exists():
-        project = completed_projects.first()
-        freelancer = get_object_or_404(Register, user=project.freelancer_id)
-        
-        client_profile = get_object_or_404(ClientProfile, user=project.user_id)
+    viewer = get_viewer(request)
+    if viewer is None:
+        return context
+    current_user = viewer.user
+
+    project = Project.objects.filter(
+        Q(freelancer=current_user.id) | Q(user=current_user.id),
+        project_status='Completed'
+    ).first()
+
+    if project:
+        # The viewer's own profiles are already loaded; only the other party is queried
+        if project.freelancer_id == current_user.id and viewer.profile:
+            freelancer = viewer.profile
+        else:
+            freelancer = get_object_or_404(Register, user=project.freelancer_id)
+
+        if project.user_id == current_user.id and viewer.client:
+            client_profile = viewer.client
+        else:
+            client_profile = get_object_or_404(ClientProfile, user=project.user_id)
         client_type = client_profile.client_type
         
         client_name = None  # Initialize client_name
         client_id = None  # Initialize client_id
 
         if client_type == 'Individual':
-            client = get_object_or_404(Register, user=project.user_id)
+            if project.user_id == current_user.id and viewer.profile:
+                client = viewer.profile
+            else:
+                client = get_object_or_404(Register, user=project.user_id)
             client_name = client.first_name
             client_id = client.id  # Assign client_id
 
@@ -73,7 +85,7 @@ def project_status(request):
             'client_review_given': project.client_review_given
         }
         
-        is_client = client_profile.user == current_user
+        is_client = client_profile.user_id == current_user.id
         context['is_client'] = is_client
     
     return context
@@ -85,52 +97,25 @@ from django.utils import timezone
 from dateutil.relativedelta import relativedelta
 from datetime import timedelta
 def review_due(request):
-    if request.user.is_authenticated:
-        user = request.user
-        registration_date = user.joined
-        now = timezone.now()
-        threshold_date = registration_date + timedelta(days=90)  
-        
-        existing_review = SiteReview.objects.filter(user=user).order_by('-created_at').first()
-        
-        if existing_review:
-            last_review_date = existing_review.created_at
-            if now >= last_review_date + timedelta(days=90):
-                return {'review_due': True}
-            else:
-                return {'review_due': False}
-        else:
-            if now >= threshold_date:
-                return {'review_due': True}
-            else:
-                return {'review_due': False}
+    viewer = get_viewer(request)
+    if viewer:
+        return {'review_due': viewer.review_due}
     return {'review_due': False}
 
 
-import razorpay
 from django.conf import settings
 from .models import RefundPayment
 def refund_payment_context(request):
+    # The Razorpay order itself is created on demand by core.views.create_refund_order
     context = {}
     if request.user.is_authenticated:
-        refund_payment = RefundPayment.objects.filter(user_id=request.user.id).first()
+        refund_payment = RefundPayment.objects.filter(user_id=request.user.id).select_related('pay_to').first()
         if refund_payment:
-            client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-            amount_in_paisa = int(refund_payment.amount * 100)  # Convert to paisa as Razorpay expects amounts in paisa
-            data = {
-                "amount": amount_in_paisa,
-                "currency": "INR",
-                "receipt": f"refund_{refund_payment.id}",
-                "payment_capture": 1,
-            }
-            order = client.order.create(data=data)
-
             context.update({
                 'has_refund_payment': True,
                 'refund_payment': refund_payment,
-                'razorpay_order_id': order['id'],
                 'razorpay_key': settings.RAZORPAY_KEY_ID,
-                'amount_in_paisa': amount_in_paisa,
+                'amount_in_paisa': int(refund_payment.amount * 100),
             })
         else:
             context['has_refund_payment'] = False
@@ -11,5 +11,12 @@ def nocache(view_func):
 def nocache_class_view(view):
     return method_decorator(nocache, name='dispatch')(view)
 
+def query_budget(max_queries):
+    # Most queries one request to the view may run, checked by core.middleware.InstrumentationMiddleware
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
 
 
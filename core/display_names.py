@@ -0,0 +1,64 @@
+from django.core.cache import cache
+
+from core.models import CustomUser
+
+
+CACHE_KEY = 'display_name:{}'
+# Entries also leave the cache when evicted by the backend's size limit
+CACHE_TIMEOUT = 60 * 60
+
+
+NAME_FIELDS = (
+    'register__id', 'register__first_name', 'register__last_name',
+    'clientprofile__client_type', 'clientprofile__company_name',
+)
+
+
+def name_fields(prefix=''):
+    # values() lookups needed by display_name_from_row, for a user reached through `prefix`
+    return [prefix + field for field in NAME_FIELDS]
+
+
+def display_name_from_row(row, prefix=''):
+    if row[prefix + 'clientprofile__client_type'] == 'Company':
+        return row[prefix + 'clientprofile__company_name']
+    if row[prefix + 'register__id'] is None:
+        return None
+    return f"{row[prefix + 'register__first_name']} {row[prefix + 'register__last_name']}"
+
+
+def display_names(user_ids):
+    """
+    Names to show for the given users, as {user_id: name}.
+
+    Companies are shown by ClientProfile.company_name and everyone else
+    (individual clients, freelancers) by their Register first and last
+    name. Cached names are reused; the rest are loaded with one query.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return {}
+
+    cached = cache.get_many([CACHE_KEY.format(user_id) for user_id in user_ids])
+    names = {}
+    for user_id in user_ids:
+        key = CACHE_KEY.format(user_id)
+        if key in cached:
+            names[user_id] = cached[key]
+
+    missing = user_ids - names.keys()
+    if missing:
+        rows = CustomUser.objects.filter(id__in=missing).values('id', *name_fields())
+        loaded = {row['id']: display_name_from_row(row) for row in rows}
+        cache.set_many({CACHE_KEY.format(user_id): name for user_id, name in loaded.items()}, CACHE_TIMEOUT)
+        names.update(loaded)
+
+    return names
+
+
+def display_name(user_id):
+    return display_names([user_id]).get(user_id)
+
+
+def invalidate_display_name(user_id):
+    cache.delete(CACHE_KEY.format(user_id))
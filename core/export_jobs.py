@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import ExportJob
+
+
+logger = logging.getLogger(__name__)
+
+# A finished file is handed out again for identical requests made within this window
+EXPORT_REUSE_TTL = timedelta(minutes=30)
+
+# A job still running after this long belongs to a worker that died and is claimed again
+EXPORT_JOB_TIMEOUT = timedelta(minutes=15)
+
+CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+EXPORT_JOB_BUILDERS = {}
+
+
+def export_job(kind):
+    """
+    Register `builder(params, format, output, progress)` for export jobs of
+    this kind. The builder writes the file to the binary file `output` and
+    may call progress(done, total) as it goes.
+    """
+    def register(builder):
+        EXPORT_JOB_BUILDERS[kind] = builder
+        return builder
+    return register
+
+
+def params_hash(kind, format, params):
+    raw = json.dumps([kind, format, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _fresh_result(digest):
+    return ExportJob.objects.filter(
+        params_hash=digest,
+        status=ExportJob.STATUS_DONE,
+        finished_at__gte=timezone.now() - EXPORT_REUSE_TTL,
+    ).exclude(file='').order_by('-finished_at').first()
+
+
+def enqueue_export(user, kind, format, params, filename):
+    """
+    Queue an export for `user` and return its job.
+
+    When an identical export (same kind, format and params) finished
+    recently, the new job is created already done and points at the stored
+    file instead of queueing the work again.
+    """
+    digest = params_hash(kind, format, params)
+    job = ExportJob(user=user, kind=kind, format=format, params=params, params_hash=digest, filename=filename)
+
+    previous = _fresh_result(digest)
+    if previous and default_storage.exists(previous.file.name):
+        job.file = previous.file.name
+        job.status = ExportJob.STATUS_DONE
+        job.progress = 100
+        job.started_at = job.finished_at = timezone.now()
+
+    job.save()
+    return job
+
+
+def claim_next_job():
+    # The conditional UPDATE makes sure two workers never run the same job
+    claimable = Q(status=ExportJob.STATUS_QUEUED) | Q(
+        status=ExportJob.STATUS_RUNNING, started_at__lt=timezone.now() - EXPORT_JOB_TIMEOUT
+    )
+    queued = ExportJob.objects.filter(claimable).order_by('created_at', 'id')
+    for job_id in queued.values_list('id', flat=True)[:10]:
+        claimed = ExportJob.objects.filter(claimable, id=job_id).update(
+            status=ExportJob.STATUS_RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return ExportJob.objects.get(id=job_id)
+    return None
+
+
+def run_job(job):
+    previous = _fresh_result(job.params_hash)
+    if previous and default_storage.exists(previous.file.name):
+        file_name = previous.file.name
+    else:
+        def progress(done, total):
+            if total:
+                ExportJob.objects.filter(id=job.id).update(progress=min(99, done * 100 // total))
+
+        builder = EXPORT_JOB_BUILDERS[job.kind]
+        with tempfile.TemporaryFile() as output:
+            builder(job.params, job.format, output, progress)
+            output.seek(0)
+            # Named per job: earlier jobs with the same parameters keep pointing at their own file
+            file_name = default_storage.save(f'exports/job_{job.id}.{job.format}', File(output))
+
+    ExportJob.objects.filter(id=job.id).update(
+        status=ExportJob.STATUS_DONE, progress=100, file=file_name, finished_at=timezone.now()
+    )
+
+
+def run_pending_jobs():
+    # Runs queued jobs until the queue is empty; returns how many were processed
+    count = 0
+    while True:
+        job = claim_next_job()
+        if job is None:
+            return count
+        try:
+            run_job(job)
+        except Exception as e:
+            logger.exception('Export job %s failed', job.id)
+            ExportJob.objects.filter(id=job.id).update(
+                status=ExportJob.STATUS_FAILED, error=str(e), finished_at=timezone.now()
+            )
+        count += 1
+
+
+def export_job_response(request, kind, format, params, filename):
+    # Used by the export views: download straight away when a stored file can be reused,
+    # otherwise show the page that polls the job until the file is ready
+    job = enqueue_export(request.user, kind, format, params, filename)
+    if job.status == ExportJob.STATUS_DONE:
+        return redirect('download_export', job_id=job.id)
+    return render(request, 'export_job.html', {
+        'job': job,
+        'status_url': reverse('export_job_status', args=[job.id]),
+        'download_url': reverse('download_export', args=[job.id]),
+    })
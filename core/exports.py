@@ -0,0 +1,112 @@
+import csv
+import io
+import tempfile
+
+import openpyxl
+from django.http import FileResponse, StreamingHttpResponse
+
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+EXPORT_SCHEMAS = {}
+
+
+class ExportSchema:
+    """
+    Columns of one spreadsheet export.
+
+    `fields` are the values() lookups read from the queryset (joins included),
+    and each column is a (header, getter) pair where the getter turns one
+    values() row into a cell. `numbered` adds a leading '#' column.
+    """
+
+    def __init__(self, name, filename, fields, columns, numbered=False):
+        self.name = name
+        self.filename = filename
+        self.fields = fields
+        self.columns = columns
+        self.numbered = numbered
+
+    @property
+    def headers(self):
+        headers = [header for header, getter in self.columns]
+        return ['#'] + headers if self.numbered else headers
+
+    def rows(self, queryset, chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+        # One joined query read through a server-side cursor; no model instances are built.
+        # progress(done, total) is called once per chunk when given.
+        total = queryset.count() if progress else None
+        rows = queryset.values(*self.fields).iterator(chunk_size=chunk_size)
+        for index, row in enumerate(rows, start=1):
+            cells = [getter(row) for header, getter in self.columns]
+            yield [index] + cells if self.numbered else cells
+            if progress and index % chunk_size == 0:
+                progress(index, total)
+
+
+def register_export(schema):
+    EXPORT_SCHEMAS[schema.name] = schema
+    return schema
+
+
+def get_export_schema(name):
+    return EXPORT_SCHEMAS[name]
+
+
+class _Echo:
+    # File-like object whose write() hands the line back, for csv.writer
+    def write(self, value):
+        return value
+
+
+def csv_response(schema, queryset):
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(schema.headers)
+        for row in schema.rows(queryset):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{schema.filename}.csv"'
+    return response
+
+
+def write_excel(schema, queryset, output, title=None, progress=None):
+    """
+    Write the export as an .xlsx file to the binary file `output`.
+
+    A write-only workbook flushes rows to a temporary file as they are
+    appended, so memory stays flat however many rows are exported.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=title or schema.name[:31])
+    ws.append(schema.headers)
+    for row in schema.rows(queryset, progress=progress):
+        ws.append(row)
+    wb.save(output)
+
+
+def write_csv(schema, queryset, output, progress=None):
+    text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(schema.headers)
+    writer.writerows(schema.rows(queryset, progress=progress))
+    text.flush()
+    text.detach()  # leave `output` open for the caller
+
+
+def excel_response(schema, queryset, title=None):
+    # The finished workbook is streamed back from disk
+    output = tempfile.TemporaryFile()
+    write_excel(schema, queryset, output, title)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=f'{schema.filename}.xlsx', content_type=XLSX_CONTENT_TYPE)
+
+
+def export_response(request, schema, queryset, title=None):
+    # ?format=csv streams CSV; anything else returns the Excel workbook
+    if request.GET.get('format') == 'csv':
+        return csv_response(schema, queryset)
+    return excel_response(schema, queryset, title)
@@ -0,0 +1,107 @@
+import contextvars
+import functools
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+
+_current = contextvars.ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Query count and time spent in the database, templates and context processors, in seconds."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.context_processor_time = 0.0
+        self._rendering = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def current_stats():
+    # Stats of the request being handled on this thread, or None outside InstrumentationMiddleware
+    return _current.get()
+
+
+@contextmanager
+def count_queries(stats):
+    # Counts every query run on any database connection while the block runs
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats.db_wrapper))
+        yield stats
+
+
+@contextmanager
+def collect_stats(stats=None):
+    # Counts queries and makes `stats` the current one for template and context processor timing
+    stats = stats or RequestStats()
+    token = _current.set(stats)
+    try:
+        with count_queries(stats):
+            yield stats
+    finally:
+        _current.reset(token)
+
+
+def _timed_processor(processor):
+    @functools.wraps(processor)
+    def wrapper(request):
+        stats = _current.get()
+        if stats is None:
+            return processor(request)
+        start = time.perf_counter()
+        try:
+            return processor(request)
+        finally:
+            stats.context_processor_time += time.perf_counter() - start
+    return wrapper
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None or stats._rendering:
+            # Templates rendered from inside another one are already being timed
+            return super().render(context, request)
+        stats._rendering += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_time += time.perf_counter() - start
+            stats._rendering -= 1
+
+
+class InstrumentedTemplates(DjangoTemplates):
+    """
+    The Django template backend, timing renders and context processors into
+    the current RequestStats. Template time includes the context processors.
+    """
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.engine.template_context_processors = tuple(
+            _timed_processor(processor) for processor in self.engine.template_context_processors
+        )
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,86 @@
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from client.models import Complaint, Project
+from core.models import LifecycleSweep, Notification
+
+
+# Rows transitioned per UPDATE, so a large backlog never holds the SQLite write lock for long
+SWEEP_BATCH_SIZE = 500
+
+# Complaints not resolved within this many days are rejected
+COMPLAINT_REJECT_DAYS = 30
+
+
+def _batches(queryset, fields):
+    # Chunks of (id, *fields) rows of a queryset ordered by id
+    rows = list(queryset.order_by('id').values_list('id', *fields)[:SWEEP_BATCH_SIZE])
+    while rows:
+        yield rows
+        rows = list(queryset.filter(id__gt=rows[-1][0]).order_by('id').values_list('id', *fields)[:SWEEP_BATCH_SIZE])
+
+
+def close_expired_projects(today):
+    # Open projects whose end date has passed are closed and their client told so
+    expired = Project.objects.filter(status='open', end_date__lt=today)
+    count = 0
+    for rows in _batches(expired, ['user_id', 'title']):
+        with transaction.atomic():
+            count += Project.objects.filter(id__in=[row[0] for row in rows], status='open').update(status='closed')
+            Notification.objects.bulk_create([
+                Notification(
+                    user_id=user_id,
+                    message=f"Your project '{title}' has been closed as its end date has passed."[:255],
+                    dedupe_key=f'project_closed:{project_id}',
+                )
+                for project_id, user_id, title in rows
+            ], ignore_conflicts=True)
+    return count
+
+
+def reject_stale_complaints(now):
+    # Pending complaints older than COMPLAINT_REJECT_DAYS are rejected and the complainant told so
+    stale = Complaint.objects.filter(status='Pending', date_filed__lt=now - datetime.timedelta(days=COMPLAINT_REJECT_DAYS))
+    count = 0
+    for rows in _batches(stale, ['user_id', 'subject']):
+        with transaction.atomic():
+            count += Complaint.objects.filter(id__in=[row[0] for row in rows], status='Pending').update(status='Rejected')
+            Notification.objects.bulk_create([
+                Notification(
+                    user_id=user_id,
+                    message=f"Your complaint '{subject}' was closed as it was not resolved within {COMPLAINT_REJECT_DAYS} days."[:255],
+                    dedupe_key=f'complaint_rejected:{complaint_id}',
+                )
+                for complaint_id, user_id, subject in rows
+            ], ignore_conflicts=True)
+    return count
+
+
+def _record(name, now, count):
+    LifecycleSweep.objects.update_or_create(name=name, defaults={'last_run_at': now, 'last_count': count})
+
+
+def run_lifecycle_sweep(now=None, force=False):
+    """
+    Apply the time-based status transitions and return {sweep name: rows changed}.
+
+    Projects expire by date, so once the project sweep has run on a day it is
+    skipped until the next one unless `force` is given (Project.save closes
+    projects saved with a past end date in between). Complaints age
+    continuously and are checked on every run. Each sweep's last run is
+    stored in LifecycleSweep.
+    """
+    now = now or timezone.now()
+    watermarks = dict(LifecycleSweep.objects.values_list('name', 'last_run_at'))
+    results = {}
+
+    last_projects_run = watermarks.get('projects')
+    if force or last_projects_run is None or last_projects_run.date() < now.date():
+        results['projects'] = close_expired_projects(now.date())
+        _record('projects', now, results['projects'])
+
+    results['complaints'] = reject_stale_complaints(now)
+    _record('complaints', now, results['complaints'])
+    return results
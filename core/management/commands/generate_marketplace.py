@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import CustomUser
+from core.synthetic import EMAIL_DOMAIN, generate_marketplace
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a generated marketplace of clients, freelancers, projects and their activity'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help='Multiplier for the number of users (20 clients and 40 freelancers each)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed generates the same data')
+
+    def handle(self, *args, **options):
+        if CustomUser.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').exists():
+            raise CommandError('Generated users already exist in this database')
+        counts = generate_marketplace(scale=options['scale'], seed=options['seed'])
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in counts.items()))
@@ -0,0 +1,83 @@
+import datetime
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core.benchmarks import compare, run_benchmarks
+from core.synthetic import ISOLATED_CACHES, generate_marketplace
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the hot views on a generated marketplace and store the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help='Scale of the generated marketplace (see generate_marketplace)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per scenario before timing')
+        parser.add_argument('--only', nargs='*', help='Scenario names to run')
+        parser.add_argument('--current-db', action='store_true',
+                            help='Use the configured database (filled by generate_marketplace) instead of a fresh test database')
+        parser.add_argument('--output', default=os.path.join(settings.BASE_DIR, 'benchmarks'), help='Directory for the JSON results')
+        parser.add_argument('--compare', help='Earlier results file to compare with')
+
+    def handle(self, *args, **options):
+        # Per-request instrumentation lines would drown the report; budget warnings still show
+        logging.getLogger('core.instrumentation').setLevel(logging.WARNING)
+        setup_test_environment()
+        # Benchmark requests must not fill or read the cache the running site uses
+        isolated_cache = override_settings(CACHES=ISOLATED_CACHES)
+        isolated_cache.enable()
+        old_name = None
+        try:
+            counts = None
+            if not options['current_db']:
+                old_name = connection.settings_dict['NAME']
+                connection.creation.create_test_db(verbosity=0, autoclobber=True)
+                counts = generate_marketplace(scale=options['scale'], seed=options['seed'])
+            results = run_benchmarks(iterations=options['iterations'], warmup=options['warmup'], only=options['only'])
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            isolated_cache.disable()
+            teardown_test_environment()
+
+        failed = {name: metrics['error'] for name, metrics in results.items() if 'error' in metrics}
+        for name, metrics in results.items():
+            if name in failed:
+                self.stdout.write(f'{name:30} FAILED  {failed[name]}')
+                continue
+            self.stdout.write(
+                f"{name:30} {metrics['status']}  p50 {metrics['p50_ms']:8.1f} ms  p95 {metrics['p95_ms']:8.1f} ms  "
+                f"{metrics['queries']:4} queries  {metrics['peak_memory_kb']:9.1f} KB"
+            )
+
+        now = datetime.datetime.now()
+        report = {
+            'created_at': now.isoformat(timespec='seconds'),
+            'scale': None if options['current_db'] else options['scale'],
+            'seed': None if options['current_db'] else options['seed'],
+            'iterations': options['iterations'],
+            'valid': not failed,
+            'data': counts,
+            'results': results,
+        }
+        os.makedirs(options['output'], exist_ok=True)
+        path = os.path.join(options['output'], f"{now:%Y%m%d-%H%M%S}-scale{options['scale']}.json")
+        with open(path, 'w') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(f'Results written to {path}')
+
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)['results']
+            for name, metric, before, after, change in compare(results, baseline):
+                self.stdout.write(f'{name:30} {metric:15} {before:10} -> {after:10} ({change:+.1f}%)')
+
+        if failed:
+            raise CommandError(f'{len(failed)} scenarios did not return 200; the run is marked invalid')
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.export_jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued export jobs and store the generated files under MEDIA_ROOT/exports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll the queue every --interval seconds')
+        parser.add_argument('--interval', type=int, default=5, help='Seconds between polls when --loop is given')
+
+    def handle(self, *args, **options):
+        while True:
+            count = run_pending_jobs()
+            if count:
+                self.stdout.write(f'Ran {count} export jobs')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.lifecycle import run_lifecycle_sweep
+
+
+class Command(BaseCommand):
+    help = 'Close expired projects and reject stale complaints, notifying the users concerned'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and sweep again every --interval seconds')
+        parser.add_argument('--interval', type=int, default=3600, help='Seconds between sweeps when --loop is given')
+        parser.add_argument('--force', action='store_true', help='Sweep projects even if that already ran today')
+
+    def handle(self, *args, **options):
+        force = options['force']
+        while True:
+            results = run_lifecycle_sweep(force=force)
+            self.stdout.write(', '.join(f'{name}: {count} updated' for name, count in results.items()))
+            if not options['loop']:
+                break
+            force = False
+            time.sleep(options['interval'])
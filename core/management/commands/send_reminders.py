@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.reminders import send_reminders
+
+
+class Command(BaseCommand):
+    help = 'Create event and payment installment reminder notifications for today and tomorrow'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and rescan every --interval seconds')
+        parser.add_argument('--interval', type=int, default=300, help='Seconds between scans when --loop is given')
+
+    def handle(self, *args, **options):
+        while True:
+            count = send_reminders()
+            self.stdout.write(f'Checked {count} reminders')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
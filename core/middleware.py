@@ -1,9 +1,111 @@
+import json
+import logging
+import time
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 
+from core.instrumentation import collect_stats, count_queries
+
 class NoCacheMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
         response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
         response['Pragma'] = 'no-cache'
         response['Expires'] = '0'
 
+
+
+logger = logging.getLogger('core.instrumentation')
+
+
+class QueryBudgetExceeded(Exception):
+    """A view decorated with core.decorators.query_budget ran more queries than allowed."""
+
+
+class InstrumentationMiddleware:
+    """
+    Records the queries, DB time, template and context processor time of
+    every request and logs them as one JSON line on the
+    core.instrumentation logger. When DEBUG is on or the user is staff they
+    are also sent back in a Server-Timing header, which would otherwise
+    show anyone how the site spends its time.
+
+    A streamed body is produced after the view returns, so its queries are
+    counted while it is iterated and the request is logged once the stream
+    ends; its Server-Timing header only covers the view itself.
+
+    A request to a view with a query budget that runs more queries logs a
+    warning, or raises QueryBudgetExceeded when settings.QUERY_BUDGET_RAISE
+    is set, as the view tests do.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.query_budget = None
+        start = time.perf_counter()
+        with collect_stats() as stats:
+            response = self.get_response(request)
+
+        if settings.DEBUG or getattr(getattr(request, 'user', None), 'is_staff', False):
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+                f'tpl;dur={stats.template_time * 1000:.1f}',
+                f'cp;dur={stats.context_processor_time * 1000:.1f}',
+                f'total;dur={(time.perf_counter() - start) * 1000:.1f}',
+            ])
+
+        if not response.streaming:
+            self.finish(request, response, stats, start)
+        elif response.is_async:
+            response.streaming_content = self.astream(response.streaming_content, request, response, stats, start)
+        else:
+            response.streaming_content = self.stream(response.streaming_content, request, response, stats, start)
+        return response
+
+    def stream(self, content, request, response, stats, start):
+        content = iter(content)
+        while True:
+            with count_queries(stats):
+                chunk = next(content, None)
+            if chunk is None:
+                break
+            yield chunk
+        self.finish(request, response, stats, start)
+
+    async def astream(self, content, request, response, stats, start):
+        # Async bodies run their queries through sync_to_async, on the connections of the request's sync thread
+        counting = count_queries(stats)
+        await sync_to_async(counting.__enter__)()
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            await sync_to_async(counting.__exit__)(None, None, None)
+        self.finish(request, response, stats, start)
+
+    def finish(self, request, response, stats, start):
+        # Logs the request and checks its query budget once the whole body has been produced
+        total = time.perf_counter() - start
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'queries': stats.queries,
+            'query_budget': request.query_budget,
+            'db_ms': round(stats.db_time * 1000, 1),
+            'template_ms': round(stats.template_time * 1000, 1),
+            'context_processor_ms': round(stats.context_processor_time * 1000, 1),
+            'total_ms': round(total * 1000, 1),
+        }
+        over_budget = request.query_budget is not None and stats.queries > request.query_budget
+        logger.log(logging.WARNING if over_budget else logging.INFO, json.dumps(record))
+
+        if over_budget and getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(f'{record["view"]} ran {stats.queries} queries, budget is {request.query_budget}')
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(view_func, 'query_budget', None)
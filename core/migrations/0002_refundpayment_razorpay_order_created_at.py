@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refundpayment',
+            name='razorpay_order_created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
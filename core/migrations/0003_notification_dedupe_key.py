@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_refundpayment_razorpay_order_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='dedupe_key',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
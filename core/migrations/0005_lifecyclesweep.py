@@ -0,0 +1,22 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LifecycleSweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_run_at', models.DateTimeField()),
+                ('last_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
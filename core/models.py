@@ -65,6 +65,10 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'  
 
     REQUIRED_FIELDS = []  
+
+    class Meta:
+        indexes = [models.Index(fields=['role', 'joined']), models.Index(fields=['joined'])]
+
     def __str__(self):
         return self.email
 
@@ -114,12 +118,23 @@ class Event(models.Model):
     color = models.CharField(max_length=7, default='#ffffff')  # Hex color code
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='events')
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'start_time']), models.Index(fields=['start_time'])]
+
 
 class Notification(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='notifications')
     message = models.CharField(max_length=255)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    dedupe_key = models.CharField(max_length=100, unique=True, null=True, blank=True)  # Set by generated reminders
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            # Unread notifications of a user, newest first
+            models.Index(fields=['user', 'created_at'], condition=models.Q(is_read=False), name='notification_unread_idx'),
+        ]
     
     
 
@@ -169,10 +184,54 @@ class RefundPayment(models.Model):
     is_paid = models.BooleanField(default=False)
     payment_date = models.DateTimeField(null=True, blank=True)
     razorpay_order_id = models.CharField(max_length=255, null=True, blank=True)
+    razorpay_order_created_at = models.DateTimeField(null=True, blank=True)
     razorpay_payment_id = models.CharField(max_length=255, null=True, blank=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='created_refund_payments')
     total_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     compensation_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
 
     def __str__(self):
-        return f"Refund Payment of {self.amount} to {self.pay_to} for Contract {self.contract.id}"
\ No newline at end of file
+        return f"Refund Payment of {self.amount} to {self.pay_to} for Contract {self.contract.id}"
+
+
+class ExportJob(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='export_jobs')
+    kind = models.CharField(max_length=50)  # key in core.export_jobs.EXPORT_JOB_BUILDERS
+    format = models.CharField(max_length=10)
+    params = models.JSONField(default=dict, blank=True)
+    params_hash = models.CharField(max_length=64, db_index=True)
+    filename = models.CharField(max_length=100)  # name offered for download
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)
+    file = models.FileField(upload_to='exports/', null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.kind} export ({self.format}) for {self.user}"
+
+
+class LifecycleSweep(models.Model):
+    # Watermark of a time-based transition run by core.lifecycle
+    name = models.CharField(max_length=50, unique=True)
+    last_run_at = models.DateTimeField()
+    last_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} swept at {self.last_run_at}"
@@ -0,0 +1,71 @@
+import functools
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+
+VERSION_KEY = 'public_page:version'
+PAGE_KEY = 'public_page:{}:{}'
+
+# The {% csrf_token %} value differs per visitor, so it is swapped for this marker in the cached copy
+CSRF_INPUT = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+CSRF_MARKER = '__public_page_csrf_token__'
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_public_pages():
+    # Moves every public page to a new cache version; the old entries expire on their own
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 1, None)
+
+
+def _is_anonymous(request):
+    # Users logged in through allauth or the session uid are redirected by these views, never cached
+    return not request.user.is_authenticated and 'uid' not in request.session
+
+
+def public_page(view_func):
+    """
+    Serve anonymous GET requests for a public page from the cache.
+
+    Entries are keyed by the full path and the current page cache version,
+    kept for settings.PUBLIC_PAGE_CACHE_SECONDS and dropped all at once by
+    invalidate_public_pages(). Logged-in users, other methods and responses
+    that are not a plain 200 go straight to the view.
+    """
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        timeout = getattr(settings, 'PUBLIC_PAGE_CACHE_SECONDS', 300)
+        if request.method not in ('GET', 'HEAD') or not timeout or not _is_anonymous(request):
+            return view_func(request, *args, **kwargs)
+
+        key = PAGE_KEY.format(_version(), request.get_full_path())
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type, uses_csrf = cached
+            if uses_csrf:
+                content = content.replace(CSRF_MARKER, get_token(request))
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Page-Cache'] = 'hit'
+            return response
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming and not response.cookies:
+            content = response.content.decode(response.charset)
+            content, replaced = CSRF_INPUT.subn(rf'\g<1>{CSRF_MARKER}\g<2>', content)
+            cache.set(key, (content, response['Content-Type'], bool(replaced)), timeout)
+            response['X-Page-Cache'] = 'miss'
+        return response
+    return wrapper
@@ -0,0 +1,59 @@
+import datetime
+
+from core.models import Event, Notification
+from client.models import PaymentInstallment
+
+
+def _day_label(day, today):
+    return 'today' if day == today else 'tomorrow'
+
+
+def build_reminders(today):
+    """
+    Notifications due for `today`: events starting today or tomorrow and
+    pending installments due today or tomorrow.
+
+    Every notification carries a dedupe_key naming the object, the kind of
+    reminder and the day, so running this any number of times per day
+    produces each reminder only once.
+    """
+    tomorrow = today + datetime.timedelta(days=1)
+    window_start = datetime.datetime.combine(today, datetime.time.min)
+    window_end = window_start + datetime.timedelta(days=2)
+
+    notifications = []
+
+    events = Event.objects.filter(start_time__gte=window_start, start_time__lt=window_end).only('id', 'title', 'start_time', 'user_id')
+    for event in events:
+        when = _day_label(event.start_time.date(), today)
+        if when == 'tomorrow':
+            message = f"Reminder: Upcoming event '{event.title}' tomorrow!"
+        else:
+            message = f"Reminder: Event '{event.title}' is today!"
+        notifications.append(Notification(
+            user_id=event.user_id,
+            message=message,
+            dedupe_key=f'event:{event.id}:{when}:{today.isoformat()}',
+        ))
+
+    installments = PaymentInstallment.objects.filter(
+        status='pending',
+        due_date__range=[today, tomorrow],
+    ).select_related('contract__project')
+    for installment in installments:
+        when = _day_label(installment.due_date, today)
+        notifications.append(Notification(
+            user_id=installment.contract.client_id,
+            message=f"Reminder: Payment installment for project '{installment.contract.project.title}' is due {when}!",
+            dedupe_key=f'installment:{installment.id}:{when}:{today.isoformat()}',
+        ))
+
+    return notifications
+
+
+def send_reminders(today=None):
+    # Returns the number of reminders considered; rows already sent are skipped by the unique key
+    today = today or datetime.date.today()
+    notifications = build_reminders(today)
+    Notification.objects.bulk_create(notifications, batch_size=500, ignore_conflicts=True)
+    return len(notifications)
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from client.models import ClientProfile
+from core.display_names import invalidate_display_name
+from core.models import Register, SiteReview
+from core.page_cache import invalidate_public_pages
+
+
+@receiver([post_save, post_delete], sender=Register)
+@receiver([post_save, post_delete], sender=ClientProfile)
+def reset_display_name(sender, instance, **kwargs):
+    invalidate_display_name(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=SiteReview)
+def reset_public_pages(sender, instance, **kwargs):
+    # Testimonials on the landing page come from site reviews
+    invalidate_public_pages()
@@ -0,0 +1,264 @@
+import datetime
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from client.models import ChatRoom, ClientProfile, Complaint, FreelanceContract, Message, PaymentInstallment, Project, Review, Task
+from core.models import CustomUser, Notification, Register
+from freelancer.catalog import PROFESSION_CATEGORIES, sync_profile_tags
+from freelancer.models import FreelancerProfile, Proposal
+from freelancer.search import index_freelancer
+
+
+# Rows generated per unit of scale; everything else is derived from these
+CLIENTS_PER_SCALE = 20
+FREELANCERS_PER_SCALE = 40
+PROJECTS_PER_CLIENT = 5
+PROPOSALS_PER_PROJECT = 4
+TASKS_PER_PROJECT = 5
+INSTALLMENTS_PER_CONTRACT = 3
+MESSAGES_PER_ROOM = 30
+NOTIFICATIONS_PER_USER = 10
+
+# Password of every generated user
+PASSWORD = 'bench-password'
+EMAIL_DOMAIN = 'bench.example.com'
+
+# Tests and benchmarks on generated data use this cache, so generated names and pages never reach the shared one
+ISOLATED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'generated-marketplace',
+    }
+}
+
+FIRST_NAMES = ['Asha', 'Rahul', 'Meera', 'Arjun', 'Divya', 'Karan', 'Neha', 'Vikram', 'Anjali', 'Rohan', 'Priya', 'Sanjay']
+LAST_NAMES = ['Nair', 'Sharma', 'Menon', 'Iyer', 'Patel', 'Reddy', 'Das', 'Kapoor', 'Thomas', 'Joseph']
+SKILLS = ['Python', 'Django', 'JavaScript', 'React', 'Figma', 'SQL', 'Flutter', 'Kotlin', 'Swift', 'Node.js', 'CSS', 'Docker']
+
+
+def _fancy_num(n):
+    # Proposal.fancy_num is unique and 5 characters long
+    digits = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    text = ''
+    for _ in range(5):
+        n, rest = divmod(n, 36)
+        text = digits[rest] + text
+    return text
+
+
+def _chunks(rows, size=500):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _create_users(rng, role, count, password):
+    users = CustomUser.objects.bulk_create([
+        CustomUser(
+            username=f'{role}{i}',
+            email=f'{role}{i}@{EMAIL_DOMAIN}',
+            password=password,
+            role=role,
+            permission=True,
+            email_verified=True,
+        )
+        for i in range(count)
+    ], batch_size=500)
+    Register.objects.bulk_create([
+        Register(
+            user=user,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            phone_number=f'9{rng.randrange(10**8, 10**9)}',
+            profile_picture='profile_pictures/default.png',
+            bio_description=f'Generated {role} profile',
+            location='Kochi',
+        )
+        for user in users
+    ], batch_size=500)
+    return users
+
+
+def generate_marketplace(scale=1, seed=0):
+    """
+    Fill the database with a marketplace of `scale` * 20 clients and
+    `scale` * 40 freelancers. It includes projects, proposals, contracts,
+    installments, tasks, chat messages, reviews and notifications.
+
+    The same seed gives the same data. Users are named client<n>,
+    freelancer<n> and admin0 @bench.example.com, with PASSWORD as their
+    password. Returns the number of rows created per model.
+    """
+    rng = random.Random(seed)
+    today = timezone.now().date()
+    password = make_password(PASSWORD)
+    professions = list(PROFESSION_CATEGORIES)
+
+    with transaction.atomic():
+        admin = CustomUser.objects.create(
+            username='admin0', email=f'admin0@{EMAIL_DOMAIN}', password=password, role='admin',
+            is_superuser=True, is_staff=True, permission=True, email_verified=True,
+        )
+        Register.objects.create(user=admin, first_name='Site', last_name='Admin', profile_picture='profile_pictures/default.png')
+
+        clients = _create_users(rng, 'client', CLIENTS_PER_SCALE * scale, password)
+        ClientProfile.objects.bulk_create([
+            ClientProfile(user=user, client_type='Company', company_name=f'{user.username.title()} Pvt Ltd')
+            if i % 3 == 0 else ClientProfile(user=user, client_type='Individual')
+            for i, user in enumerate(clients)
+        ], batch_size=500)
+
+        freelancers = _create_users(rng, 'freelancer', FREELANCERS_PER_SCALE * scale, password)
+        profiles = FreelancerProfile.objects.bulk_create([
+            FreelancerProfile(
+                user=user,
+                professional_title=str(rng.sample(professions, 2)),
+                skills=str(rng.sample(SKILLS, 4)),
+                experience_level=rng.choice(['Beginner', 'Intermediate', 'Expert']),
+                work_type=rng.choice(['full_time', 'part_time']),
+            )
+            for user in freelancers
+        ], batch_size=500)
+        # bulk_create skips the signals that keep the search index and tags in sync
+        for profile in profiles:
+            index_freelancer(profile)
+            sync_profile_tags(profile)
+
+        projects = []
+        for client in clients:
+            for i in range(PROJECTS_PER_CLIENT):
+                budget = rng.randrange(5, 200) * 1000
+                gst = Decimal(budget) * Decimal('0.18')
+                end_date = today + datetime.timedelta(days=rng.randrange(-30, 90))
+                projects.append(Project(
+                    title=f'{rng.choice(list(PROFESSION_CATEGORIES.values()))} project {client.id}-{i}',
+                    description='Generated project for benchmarks. ' * 5,
+                    budget=budget,
+                    gst_amount=gst,
+                    total_including_gst=budget + gst,
+                    category=rng.choice(list(PROFESSION_CATEGORIES.values())),
+                    allow_bid=rng.random() < 0.5,
+                    end_date=end_date,
+                    status='open' if end_date >= today else 'closed',
+                    scope=rng.choice(['low', 'medium', 'high']),
+                    user=client,
+                ))
+        projects = Project.objects.bulk_create(projects, batch_size=500)
+
+        proposals = []
+        for project in projects:
+            for freelancer in rng.sample(freelancers, min(PROPOSALS_PER_PROJECT, len(freelancers))):
+                proposals.append(Proposal(
+                    project=project,
+                    freelancer=freelancer,
+                    proposal_details='<p>Generated proposal</p>',
+                    budget=project.budget,
+                    deadline=today + datetime.timedelta(days=rng.randrange(10, 120)),
+                    fancy_num=_fancy_num(len(proposals)),
+                ))
+        Proposal.objects.bulk_create(proposals, batch_size=500)
+
+        # Half of the projects are hired: one proposal accepted, contract, installments, tasks and chat
+        hired = [project for project in projects if rng.random() < 0.5]
+        hired_ids = {project.id for project in hired}
+        accepted = {}
+        for proposal in proposals:
+            if proposal.project_id in hired_ids and proposal.project_id not in accepted:
+                accepted[proposal.project_id] = proposal
+                proposal.status = Proposal.ACCEPTED
+        Proposal.objects.bulk_update(accepted.values(), ['status'], batch_size=500)
+
+        for project in hired:
+            project.freelancer = accepted[project.id].freelancer
+            project.start_date = today - datetime.timedelta(days=rng.randrange(1, 60))
+            project.project_end_date = project.start_date + datetime.timedelta(days=rng.randrange(30, 120))
+            project.project_status = rng.choice(['In Progress', 'In Progress', 'Completed'])
+        Project.objects.bulk_update(hired, ['freelancer', 'start_date', 'project_end_date', 'project_status'], batch_size=500)
+
+        contracts = FreelanceContract.objects.bulk_create([
+            FreelanceContract(client=project.user, freelancer=project.freelancer, project=project)
+            for project in hired
+        ], batch_size=500)
+
+        installments, tasks, reviews = [], [], []
+        for contract, project in zip(contracts, hired):
+            for i in range(INSTALLMENTS_PER_CONTRACT):
+                due_date = project.start_date + datetime.timedelta(days=30 * (i + 1))
+                paid = due_date < today
+                installments.append(PaymentInstallment(
+                    contract=contract,
+                    amount=Decimal(project.budget) / INSTALLMENTS_PER_CONTRACT,
+                    due_date=due_date,
+                    status='paid' if paid else 'pending',
+                    paid_at=due_date if paid else None,
+                ))
+            for i in range(TASKS_PER_PROJECT):
+                tasks.append(Task(
+                    project=project,
+                    title=f'Task {i + 1}',
+                    due_date=timezone.now() + datetime.timedelta(days=rng.randrange(-10, 40)),
+                    status=rng.choice(['Pending', 'In Progress', 'Completed']),
+                    progress_percentage=rng.choice([0, 25, 50, 75, 100]),
+                ))
+            if project.project_status == 'Completed':
+                for reviewer, reviewee in [(project.user, project.freelancer), (project.freelancer, project.user)]:
+                    reviews.append(Review(
+                        project=project, reviewer=reviewer, reviewee=reviewee,
+                        review_text='Generated review', overall_rating=rng.randrange(3, 6),
+                    ))
+        PaymentInstallment.objects.bulk_create(installments, batch_size=500)
+        Task.objects.bulk_create(tasks, batch_size=500)
+        Review.objects.bulk_create(reviews, batch_size=500)
+
+        rooms = ChatRoom.objects.bulk_create([ChatRoom(project=project) for project in hired], batch_size=500)
+        ChatRoom.participants.through.objects.bulk_create([
+            ChatRoom.participants.through(chatroom_id=room.id, customuser_id=user_id)
+            for room, project in zip(rooms, hired)
+            for user_id in (project.user_id, project.freelancer_id)
+        ], batch_size=500)
+        messages = [
+            Message(
+                chat_room=room,
+                sender_id=project.user_id if i % 2 == 0 else project.freelancer_id,
+                content=f'Generated message {i}',
+            )
+            for room, project in zip(rooms, hired)
+            for i in range(MESSAGES_PER_ROOM)
+        ]
+        for batch in _chunks(messages):
+            Message.objects.bulk_create(batch)
+
+        users = clients + freelancers
+        notifications = [
+            Notification(user=user, message=f'Generated notification {i}', is_read=i % 3 != 0)
+            for user in users
+            for i in range(NOTIFICATIONS_PER_USER)
+        ]
+        for batch in _chunks(notifications):
+            Notification.objects.bulk_create(batch)
+
+        complaints = Complaint.objects.bulk_create([
+            Complaint(
+                user=rng.choice(users),
+                complaint_type='Site Issue',
+                subject=f'Generated complaint {i}',
+                description='Generated complaint for benchmarks',
+            )
+            for i in range(2 * scale)
+        ])
+
+    return {
+        'users': len(users) + 1,
+        'projects': len(projects),
+        'proposals': len(proposals),
+        'contracts': len(contracts),
+        'installments': len(installments),
+        'tasks': len(tasks),
+        'reviews': len(reviews),
+        'messages': len(messages),
+        'notifications': len(notifications),
+        'complaints': len(complaints),
+    }
@@ -1,3 +1,145 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+import unittest
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.middleware import InstrumentationMiddleware
+from core.models import CustomUser, Event, Notification
+from core.synthetic import EMAIL_DOMAIN, ISOLATED_CACHES, generate_marketplace
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+@override_settings(CACHES=ISOLATED_CACHES)
+class QueryPlanTestCase(TestCase):
+    """
+    Base for tests that a hot queryset is answered from an index.
+
+    assertIndexed runs EXPLAIN QUERY PLAN on the queryset and fails unless
+    it looks rows up with an index ("SEARCH <table> USING INDEX"). Walking a
+    whole index in order ("SCAN <table> USING INDEX") is only accepted for
+    sliced querysets, which stop after a page of rows; any other SCAN fails.
+    """
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertIndexed(self, queryset, index=None):
+        plan = self.query_plan(queryset)
+        sliced = queryset.query.is_sliced
+        indexed = [
+            step for step in plan
+            if step.startswith('SEARCH ') or (sliced and step.startswith('SCAN ') and ' INDEX ' in step)
+        ]
+        scans = [step for step in plan if step.startswith('SCAN ') and step not in indexed]
+        self.assertEqual(scans, [], f'Scan in query plan: {plan}')
+        self.assertTrue(indexed, f'No index lookup in query plan: {plan}')
+        if index:
+            self.assertTrue(any(index in step for step in plan), f'{index} not used in query plan: {plan}')
+        return plan
+
+
+@override_settings(QUERY_BUDGET_RAISE=True, CACHES=ISOLATED_CACHES)
+class QueryBudgetTestCase(TestCase):
+    """
+    Base for tests that request a view with a query budget through the
+    middleware, on a generated marketplace. Going over the budget raises
+    QueryBudgetExceeded, so the test fails.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_marketplace(scale=1)
+
+    def login(self, username):
+        # `username` is a generated user such as client0; the views read the session uid
+        user = CustomUser.objects.get(email=f'{username}@{EMAIL_DOMAIN}')
+        self.client.force_login(user)
+        session = self.client.session
+        session['uid'] = user.id
+        session.save()
+
+    def get(self, username, path):
+        self.login(username)
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+
+class CoreQueryPlanTests(QueryPlanTestCase):
+    def test_notification_feed(self):
+        plan = self.assertIndexed(Notification.objects.filter(user_id=1).order_by('-created_at')[:5])
+        self.assertFalse(any('TEMP B-TREE' in step for step in plan), plan)
+
+    def test_unread_notifications(self):
+        self.assertIndexed(Notification.objects.filter(user_id=1, is_read=False).order_by('-created_at'), 'notification_unread_idx')
+
+    def test_events_of_user_in_range(self):
+        today = datetime.datetime(2024, 1, 1)
+        self.assertIndexed(Event.objects.filter(user_id=1, start_time__range=[today, today + datetime.timedelta(days=7)]))
+
+    def test_events_starting_soon(self):
+        # core.reminders
+        today = datetime.datetime(2024, 1, 1)
+        self.assertIndexed(Event.objects.filter(start_time__gte=today, start_time__lt=today + datetime.timedelta(days=2)))
+
+    def test_users_by_role(self):
+        self.assertIndexed(CustomUser.objects.filter(role='client').order_by('-joined'))
+
+    def test_user_list_page(self):
+        # administrator allusers
+        self.assertIndexed(CustomUser.objects.filter(is_superuser=False).order_by('-joined', '-id')[:20])
+
+
+class InstrumentationMiddlewareTests(TestCase):
+    def stream(self, view):
+        request = RequestFactory().get('/stream/')
+        request.resolver_match = None
+        return InstrumentationMiddleware(view)(request)
+
+    def test_streamed_queries_are_counted_when_the_stream_ends(self):
+        def rows():
+            for role in ('client', 'freelancer'):
+                yield f'{CustomUser.objects.filter(role=role).count()}\n'
+
+        response = self.stream(lambda request: StreamingHttpResponse(rows()))
+        with self.assertLogs('core.instrumentation', 'INFO') as logs:
+            self.assertEqual(b''.join(response.streaming_content), b'0\n0\n')
+        self.assertEqual(json.loads(logs.records[0].getMessage())['queries'], 2)
+
+    def test_async_streamed_queries_are_counted(self):
+        async def rows():
+            for role in ('client', 'freelancer'):
+                yield f'{await sync_to_async(CustomUser.objects.filter(role=role).count)()}\n'
+
+        async def read(response):
+            return [chunk async for chunk in response.streaming_content]
+
+        response = self.stream(lambda request: StreamingHttpResponse(rows()))
+        with self.assertLogs('core.instrumentation', 'INFO') as logs:
+            self.assertEqual(asyncio.run(read(response)), [b'0\n', b'0\n'])
+        self.assertEqual(json.loads(logs.records[0].getMessage())['queries'], 2)
+
+    @override_settings(DEBUG=False)
+    def test_server_timing_only_for_staff(self):
+        staff = CustomUser(email='staff@example.com', is_staff=True)
+        for user, sent in [(AnonymousUser(), False), (CustomUser(email='client@example.com'), False), (staff, True)]:
+            request = RequestFactory().get('/')
+            request.user = user
+            response = InstrumentationMiddleware(lambda request: HttpResponse())(request)
+            self.assertEqual(response.has_header('Server-Timing'), sent, user)
+
+    @override_settings(DEBUG=True)
+    def test_server_timing_in_debug(self):
+        response = InstrumentationMiddleware(lambda request: HttpResponse())(RequestFactory().get('/'))
+        self.assertTrue(response.has_header('Server-Timing'))
@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.shortcuts import render
 from django.urls import include, path
 
-from core.views import  payment_success, update_cancellation_status,request_cancellation,check_email,about, add_user_type, contact, email_verification, index, login, login_view, logout, register, register_view, reset_password, send_forget_password_mail, send_verification_mail, service,faqs, site_review
+from core.views import  download_export, export_job_status, create_refund_order, payment_success, update_cancellation_status,request_cancellation,check_email,about, add_user_type, contact, email_verification, index, login, login_view, logout, register, register_view, reset_password, send_forget_password_mail, send_verification_mail, service,faqs, site_review
 
 
 urlpatterns = [
@@ -29,4 +29,7 @@ urlpatterns = [
     path('request_cancellation/<int:project_id>', request_cancellation, name='request_cancellation'),
        path('update_cancellation_status/<int:cancellation_id>/', update_cancellation_status, name='update_cancellation_status'),
        path('payment_success/', payment_success, name='payment_success'),
+       path('create_refund_order/', create_refund_order, name='create_refund_order'),
+       path('export_jobs/<int:job_id>/', export_job_status, name='export_job_status'),
+       path('export_jobs/<int:job_id>/download/', download_export, name='download_export'),
 ]
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from core.models import CustomUser, Notification, SiteReview
+
+
+class Viewer:
+    """
+    Everything a page needs to know about the logged in user, loaded once per
+    request.
+
+    The user, Register, ClientProfile and FreelancerProfile rows come from a
+    single joined query; notifications and the review flag are only queried
+    when a template or view first asks for them. Views and context processors
+    share the same instance through `get_viewer`, so objects edited by a view
+    (e.g. a new profile picture) are what the base templates render.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    def _related(self, name):
+        try:
+            return getattr(self.user, name)
+        except ObjectDoesNotExist:
+            return None
+
+    @cached_property
+    def profile(self):
+        return self._related('register')
+
+    @cached_property
+    def client(self):
+        return self._related('clientprofile')
+
+    @cached_property
+    def freelancer(self):
+        return self._related('freelancerprofile')
+
+    @property
+    def role_profile(self):
+        if self.user.role == 'client':
+            return self.client
+        if self.user.role == 'freelancer':
+            return self.freelancer
+        return None
+
+    @cached_property
+    def unread_notifications(self):
+        notifications = Notification.objects.filter(user=self.user, is_read=False)
+        len(notifications)  # evaluate once so .count and loops in templates reuse the rows
+        return notifications
+
+    @cached_property
+    def review_due(self):
+        now = timezone.now()
+        existing_review = SiteReview.objects.filter(user=self.user).order_by('-created_at').first()
+        if existing_review:
+            return now >= existing_review.created_at + timedelta(days=90)
+        return now >= self.user.joined + timedelta(days=90)
+
+
+def get_viewer(request):
+    # Returns None for anonymous users; the viewer is memoized on the request
+    if not request.user.is_authenticated:
+        return None
+
+    viewer = getattr(request, '_viewer', None)
+    if viewer is None or viewer.user.id != request.user.id:
+        user = CustomUser.objects.select_related(
+            'register', 'clientprofile', 'freelancerprofile'
+        ).get(id=request.user.id)
+        viewer = Viewer(user)
+        request._viewer = viewer
+    return viewer
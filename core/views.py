@@ -9,6 +9,8 @@ from django.shortcuts import render,redirect
 
 from client.models import ClientProfile, Project, Review
 from .models import EmailVerification, Notification, PasswordReset, CustomUser, Register, SiteReview
+from .display_names import display_names
+from .page_cache import public_page
 from django.core.mail import EmailMessage
 from django.contrib import messages
 from django.core.mail import send_mail
@@ -27,14 +29,19 @@ from urllib.parse import urlencode
 from django.http import JsonResponse
 
 
+# Latest site reviews shown as testimonials on the landing page
+TESTIMONIAL_COUNT = 10
+
+
+@public_page
 def index(request):
-    close_expired_projects()
-    reviews = SiteReview.objects.all().order_by('-created_at')
+    reviews = SiteReview.objects.select_related('user__register').order_by('-created_at')[:TESTIMONIAL_COUNT]
 
     if request.user.is_authenticated or 'uid' in request.session:
         uid = request.user
         print(uid)
         return redirect_based_on_user_type(request, request.user)
+    names = display_names(review.user_id for review in reviews)
     review_details = []
     for review in reviews:
         user = review.user
@@ -42,28 +49,10 @@ def index(request):
 
         if hasattr(user, 'register'): 
             register = user.register
-            user_type = user.role 
-            
-            if user_type == 'freelancer':
-                user_info = {
-                    'name': f"{register.first_name} {register.last_name}",
-                    'profile_picture': register.profile_picture.url if register.profile_picture else None
-                }
-            elif user_type == 'client':
-                try:
-                    client_profile = ClientProfile.objects.get(user=user)
-                    if client_profile.client_type == 'Individual':
-                        user_info = {
-                            'name': f"{register.first_name} {register.last_name}",
-                            'profile_picture': register.profile_picture.url if register.profile_picture else None
-                        }
-                    else:
-                        user_info = {
-                            'name': client_profile.company_name,
-                            'profile_picture': register.profile_picture.url if register.profile_picture else None
-                        }
-                except ClientProfile.DoesNotExist:
-                    user_info = None
+            user_info = {
+                'name': names.get(user.id),
+                'profile_picture': register.profile_picture.url if register.profile_picture else None
+            }
         
         review_details.append({
             'review': review,
@@ -81,22 +70,14 @@ def check_email(request):
     return JsonResponse(data)
 
 
-def close_expired_projects():
-    now = timezone.now()
-    expired_projects = Project.objects.filter(end_date__lt=now, status='open')
-    count = expired_projects.update(status='closed')
-    return count
-    
-
-
-
-
+@public_page
 def about(request):
     if request.user.is_authenticated:
         uid=request.user
         return redirect_based_on_user_type(request, request.user)
     return render(request,'about.html')
 
+@public_page
 def contact(request):
     if request.user.is_authenticated:
         uid=request.user
@@ -123,6 +104,7 @@ def contact(request):
         return render(request, 'contact.html', {'msg': msg})
     return render(request, 'contact.html')
 
+@public_page
 def service(request):
     if request.user.is_authenticated:
         uid=request.user
@@ -146,6 +128,7 @@ def register_view(request):
     print("Rendering register page")
     return render(request, 'login.html', {'page': 'sign-up'})
 
+@public_page
 def faqs(request):
     if request.user.is_authenticated:
         uid=request.user
@@ -597,4 +580,110 @@ def payment_success(request):
                 return JsonResponse({'status': 'failed', 'error': 'Refund payment not found'}, status=404)
         else:
             return JsonResponse({'status': 'failed', 'error': 'Invalid data received'}, status=400)
-    
\ No newline at end of file
+    
+
+
+import logging
+
+import razorpay
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Razorpay orders are reused for a refund until they are paid or older than this
+REFUND_ORDER_TTL = timedelta(hours=24)
+
+
+def get_refund_order(refund_payment):
+    """
+    The Razorpay order id of the refund, or None if it has been paid meanwhile.
+
+    A stored order younger than REFUND_ORDER_TTL is reused. Otherwise a new
+    order is created, outside any transaction since it is an HTTP call, and
+    stored only if the refund still has the order it had when it was read;
+    when another request stored one first, that order is returned instead.
+    """
+    now = timezone.now()
+    created_at = refund_payment.razorpay_order_created_at
+    if refund_payment.razorpay_order_id and created_at and now - created_at < REFUND_ORDER_TTL:
+        return refund_payment.razorpay_order_id
+
+    client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+    order = client.order.create(data={
+        "amount": int(refund_payment.amount * 100),  # Razorpay expects amounts in paisa
+        "currency": "INR",
+        "receipt": f"refund_{refund_payment.id}",
+        "payment_capture": 1,
+    })
+
+    stored = RefundPayment.objects.filter(
+        id=refund_payment.id, is_paid=False, razorpay_order_id=refund_payment.razorpay_order_id,
+    ).update(razorpay_order_id=order['id'], razorpay_order_created_at=now)
+    if not stored:
+        refund_payment.refresh_from_db(fields=['is_paid', 'razorpay_order_id', 'razorpay_order_created_at'])
+        return None if refund_payment.is_paid else refund_payment.razorpay_order_id
+
+    refund_payment.razorpay_order_id = order['id']
+    refund_payment.razorpay_order_created_at = now
+    return order['id']
+
+
+@login_required
+def create_refund_order(request):
+    if request.method != 'POST':
+        return JsonResponse({'status': 'failed', 'error': 'Invalid request method'}, status=405)
+
+    refund_payment_id = request.POST.get('refund_payment_id')
+    try:
+        # The lock is held only while the stored order is read; get_refund_order calls Razorpay after it
+        with transaction.atomic():
+            refund_payment = RefundPayment.objects.select_for_update().get(id=refund_payment_id, user=request.user)
+    except (RefundPayment.DoesNotExist, ValueError):
+        return JsonResponse({'status': 'failed', 'error': 'Refund payment not found'}, status=404)
+    if refund_payment.is_paid:
+        return JsonResponse({'status': 'failed', 'error': 'Refund payment is already paid'}, status=400)
+
+    try:
+        order_id = get_refund_order(refund_payment)
+    except Exception:
+        logger.exception('Could not create a Razorpay order for refund payment %s', refund_payment.id)
+        return JsonResponse({'status': 'failed', 'error': 'Unable to create payment order'}, status=502)
+    if order_id is None:
+        return JsonResponse({'status': 'failed', 'error': 'Refund payment is already paid'}, status=400)
+
+    return JsonResponse({
+        'status': 'success',
+        'order_id': order_id,
+        'amount': int(refund_payment.amount * 100),
+        'key': settings.RAZORPAY_KEY_ID,
+    })
+
+
+from django.http import FileResponse
+from core.export_jobs import CONTENT_TYPES
+from core.models import ExportJob
+
+@login_required
+def export_job_status(request, job_id):
+    job = get_object_or_404(ExportJob, id=job_id, user=request.user)
+    data = {
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+    }
+    if job.status == ExportJob.STATUS_DONE:
+        data['download_url'] = reverse('download_export', args=[job.id])
+    return JsonResponse(data)
+
+
+@login_required
+def download_export(request, job_id):
+    job = get_object_or_404(ExportJob, id=job_id, user=request.user, status=ExportJob.STATUS_DONE)
+    return FileResponse(
+        job.file.open('rb'),
+        as_attachment=True,
+        filename=job.filename,
+        content_type=CONTENT_TYPES.get(job.format, 'application/octet-stream'),
+    )
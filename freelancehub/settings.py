@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -63,8 +64,6 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     
     'allauth.account.middleware.AccountMiddleware',
-    'django.middleware.cache.UpdateCacheMiddleware',
-    'django.middleware.cache.FetchFromCacheMiddleware',
     
     
 ]
@@ -73,9 +72,8 @@ MIDDLEWARE = [
 
 
 
-CACHE_MIDDLEWARE_ALIAS = 'default'
-CACHE_MIDDLEWARE_SECONDS = 0
-CACHE_MIDDLEWARE_KEY_PREFIX = ''
+# Anonymous visits to the landing and marketing pages are served from the cache (core.page_cache)
+PUBLIC_PAGE_CACHE_SECONDS = 300
 
 
 ROOT_URLCONF = 'freelancehub.urls'
@@ -85,7 +83,7 @@ CSRF_TRUSTED_ORIGINS = ['https://freelancehub-production.up.railway.app']
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.instrumentation.InstrumentedTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates'),
             os.path.join(BASE_DIR, 'media/templates'),],
         
@@ -142,6 +140,15 @@ DATABASES = {
     }
 }
 
+# Shared by every web and worker process on the host (they already share the SQLite file), so
+# invalidating the page, analytics and name caches reaches all of them
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -238,3 +245,29 @@ RAZORPAY_KEY_SECRET = 'eIKYygydEQ5iicHT2N6gaVuC'
 # settings.py
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10 MB (adjust as needed)
 
+
+# spaCy is only loaded by the processes that need it (freelancer.nlp); set
+# NLP_ENABLED=0 in the environment of web workers to forbid loading it there
+NLP_ENABLED = os.environ.get('NLP_ENABLED', '1') != '0'
+
+
+# Per-request query counts and timings (core.middleware.InstrumentationMiddleware), logged as
+# JSON lines; requests over a view's query budget are logged as warnings. Only the warnings are
+# shown unless INSTRUMENTATION_LOG_LEVEL=INFO is set, so test runs are not flooded.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.instrumentation': {
+            'handlers': ['console'],
+            'level': os.environ.get('INSTRUMENTATION_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# Going over a query budget (core.decorators.query_budget) raises instead of logging a warning; tests turn it on
+QUERY_BUDGET_RAISE = False
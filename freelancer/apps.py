@@ -1,11 +1,3 @@
-
-from django.apps import AppConfig
-
-
-class FreelancerConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'freelancer'
-
 from django.apps import AppConfig
 
 
@@ -13,3 +5,5 @@ class FreelancerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'freelancer'
 
+    def ready(self):
+        from freelancer import signals
@@ -0,0 +1,52 @@
+from client.models import Project
+from freelancer.models import Profession, Skill
+from freelancer.search import parse_list_field
+
+
+# Project category each profession works on
+PROFESSION_CATEGORIES = {
+    'Web Developer': 'Web Development',
+    'Front-End Developer': 'Front-End Development',
+    'Back-End Developer': 'Back-End Development',
+    'Full-Stack Developer': 'Full-Stack Development',
+    'Mobile App Developer': 'Mobile Development',
+    'Android Developer': 'Android Development',
+    'iOS Developer': 'iOS Development',
+    'UI/UX Designer': 'UI/UX Design',
+    'Graphic Designer': 'Graphic Design',
+    'Logo Designer': 'Logo Design',
+    'Poster Designer': 'Poster Design',
+    'Machine Learning Engineer': 'Machine Learning Engineering',
+    'Artificial Intelligence Specialist': 'Artificial Intelligence',
+    'Software Developer': 'Software Development',
+}
+
+
+def _get_or_create_all(model, names, defaults=None):
+    # One query for the names that exist, one bulk insert for the rest
+    names = list(dict.fromkeys(name[:100] for name in names))
+    existing = {obj.name: obj for obj in model.objects.filter(name__in=names)}
+    missing = [model(name=name, **(defaults or {}).get(name, {})) for name in names if name not in existing]
+    if missing:
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+        existing.update({obj.name: obj for obj in model.objects.filter(name__in=[m.name for m in missing])})
+    return [existing[name] for name in names]
+
+
+def sync_profile_tags(profile):
+    """Mirror the stored skills/professional_title lists into the M2M catalog."""
+    skills = parse_list_field(profile.skills)
+    professions = parse_list_field(profile.professional_title)
+
+    profile.skill_tags.set(_get_or_create_all(Skill, skills))
+    profile.profession_tags.set(_get_or_create_all(
+        Profession, professions,
+        {name: {'category': PROFESSION_CATEGORIES.get(name, '')} for name in professions}
+    ))
+
+
+def projects_for_freelancer(profile):
+    """Projects in any category covered by the freelancer's professions."""
+    return Project.objects.filter(
+        category__in=Profession.objects.filter(freelancers=profile).exclude(category='').values('category')
+    )
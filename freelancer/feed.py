@@ -0,0 +1,64 @@
+import base64
+import datetime
+
+from django.db.models import Q
+
+from core.display_names import display_names
+from freelancer.models import Proposal
+
+
+FEED_PAGE_SIZE = 20
+
+
+def encode_cursor(project):
+    raw = f'{project.created_at.isoformat()}|{project.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    # Returns (created_at, id) of the last project of the previous page, or None if invalid
+    try:
+        created_at, project_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.datetime.fromisoformat(created_at), int(project_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def project_feed(projects, freelancer_id, cursor=None, page_size=FEED_PAGE_SIZE):
+    """
+    One page of the project board, newest first.
+
+    Pages are keyed on (created_at, id) rather than an offset, so each page is
+    an index range scan no matter how deep the freelancer scrolls. The
+    client's Register is joined in for the card picture, client names come
+    from core.display_names and the has_proposal flags of the whole page come
+    from one IN query. Returns the page rows and the cursor of the next page
+    (None on the last page).
+    """
+    projects = projects.select_related('user__register').order_by('-created_at', '-id')
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, project_id = position
+        projects = projects.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=project_id))
+
+    page = list(projects[:page_size + 1])
+    next_cursor = encode_cursor(page[page_size - 1]) if len(page) > page_size else None
+    page = page[:page_size]
+
+    proposed = set(Proposal.objects.filter(
+        freelancer_id=freelancer_id, project_id__in=[project.id for project in page]
+    ).values_list('project_id', flat=True))
+
+    client_names = display_names(project.user_id for project in page)
+
+    project_details = []
+    for project in page:
+        project_details.append({
+            'project': project,
+            'client_register': getattr(project.user, 'register', None),
+            'client_name': client_names.get(project.user_id),
+            'has_proposal': project.id in proposed,
+        })
+
+    return project_details, next_cursor
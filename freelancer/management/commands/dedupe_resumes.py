@@ -0,0 +1,44 @@
+import hashlib
+
+from django.core.management.base import BaseCommand
+
+from freelancer.models import Document, ParsedResume
+
+
+class Command(BaseCommand):
+    help = 'Link uploaded resumes to ParsedResume by content hash and delete duplicate files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be changed')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        shared = dict(ParsedResume.objects.values_list('sha256', 'file'))  # sha256 -> file kept
+        duplicates = set()
+        linked = 0
+
+        documents = Document.objects.filter(parsed_resume__isnull=True).exclude(resume_file='').exclude(resume_file=None)
+        for document in documents:
+            try:
+                with document.resume_file.open('rb') as resume:
+                    digest = hashlib.sha256(resume.read()).hexdigest()
+            except FileNotFoundError:
+                continue
+
+            # The first copy seen becomes the shared file
+            name = shared.setdefault(digest, document.resume_file.name)
+            if name != document.resume_file.name:
+                duplicates.add(document.resume_file.name)
+            if not dry_run:
+                parsed, created = ParsedResume.objects.get_or_create(sha256=digest, defaults={'file': name})
+                Document.objects.filter(id=document.id).update(parsed_resume=parsed, resume_file=name)
+            linked += 1
+
+        kept = set(shared.values())
+        storage = ParsedResume._meta.get_field('file').storage
+        for name in sorted(duplicates - kept):
+            self.stdout.write(f'{"Would delete" if dry_run else "Deleting"} {name}')
+            if not dry_run:
+                storage.delete(name)
+
+        self.stdout.write(f'Linked {linked} documents, {len(duplicates - kept)} duplicate files')
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from freelancer.resume_pipeline import run_pending_documents
+
+
+class Command(BaseCommand):
+    help = 'Build portfolios for uploaded resumes (extract, parse, render, thumbnail)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll for new resumes every --interval seconds')
+        parser.add_argument('--interval', type=int, default=5, help='Seconds between polls when --loop is given')
+
+    def handle(self, *args, **options):
+        while True:
+            count = run_pending_documents()
+            if count:
+                self.stdout.write(f'Processed {count} resumes')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
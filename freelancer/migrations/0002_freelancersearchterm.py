@@ -0,0 +1,99 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:29
+
+import django.db.models.deletion
+import re
+
+from django.db import migrations, models
+
+
+# Copy of freelancer.search as of this migration, so later changes to the
+# tokenizer do not change what this migration writes
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+NAME_WEIGHT = 4
+PROFESSION_WEIGHT = 3
+SKILL_WEIGHT = 2
+
+
+def parse_list_field(value):
+    items = value.strip('[]').replace("'", "").split(', ') if value else []
+    return [item.strip() for item in items if item and item.strip()]
+
+
+def normalize(text):
+    return ' '.join(text.lower().split())
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def build_terms(username, first_name, last_name, professional_title, skills):
+    terms = {}
+
+    def add(kind, term, weight):
+        term = term[:100]
+        if term and terms.get((kind, term), 0) < weight:
+            terms[(kind, term)] = weight
+
+    for text in (username, first_name, last_name):
+        for token in tokenize(text):
+            add('word', token, NAME_WEIGHT)
+    for profession in parse_list_field(professional_title):
+        add('profession', normalize(profession), 1)
+        for token in tokenize(profession):
+            add('word', token, PROFESSION_WEIGHT)
+    for skill in parse_list_field(skills):
+        add('skill', normalize(skill), 1)
+        for token in tokenize(skill):
+            add('word', token, SKILL_WEIGHT)
+
+    return [(kind, term, weight) for (kind, term), weight in terms.items()]
+
+
+def index_existing_profiles(apps, schema_editor):
+    FreelancerProfile = apps.get_model('freelancer', 'FreelancerProfile')
+    FreelancerSearchTerm = apps.get_model('freelancer', 'FreelancerSearchTerm')
+    Register = apps.get_model('core', 'Register')
+
+    names = {register.user_id: register for register in Register.objects.all()}
+    rows = []
+    for profile in FreelancerProfile.objects.select_related('user'):
+        register = names.get(profile.user_id)
+        terms = build_terms(
+            profile.user.username,
+            register.first_name if register else '',
+            register.last_name if register else '',
+            profile.professional_title,
+            profile.skills,
+        )
+        rows.extend(
+            FreelancerSearchTerm(profile=profile, kind=kind, term=term, weight=weight)
+            for kind, term, weight in terms
+        )
+    FreelancerSearchTerm.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('freelancer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FreelancerSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('word', 'Word'), ('profession', 'Profession'), ('skill', 'Skill')], max_length=10)),
+                ('term', models.CharField(max_length=100)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='freelancer.freelancerprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'term'], name='freelancer__kind_7b4d5c_idx')],
+                'unique_together': {('profile', 'kind', 'term')},
+            },
+        ),
+        migrations.RunPython(index_existing_profiles, migrations.RunPython.noop),
+    ]
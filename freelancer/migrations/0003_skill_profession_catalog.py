@@ -0,0 +1,87 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:31
+
+from django.db import migrations, models
+
+
+# Copies of freelancer.catalog / freelancer.search as of this migration
+PROFESSION_CATEGORIES = {
+    'Web Developer': 'Web Development',
+    'Front-End Developer': 'Front-End Development',
+    'Back-End Developer': 'Back-End Development',
+    'Full-Stack Developer': 'Full-Stack Development',
+    'Mobile App Developer': 'Mobile Development',
+    'Android Developer': 'Android Development',
+    'iOS Developer': 'iOS Development',
+    'UI/UX Designer': 'UI/UX Design',
+    'Graphic Designer': 'Graphic Design',
+    'Logo Designer': 'Logo Design',
+    'Poster Designer': 'Poster Design',
+    'Machine Learning Engineer': 'Machine Learning Engineering',
+    'Artificial Intelligence Specialist': 'Artificial Intelligence',
+    'Software Developer': 'Software Development',
+}
+
+
+def parse_list_field(value):
+    items = value.strip('[]').replace("'", "").split(', ') if value else []
+    return [item.strip() for item in items if item and item.strip()]
+
+
+def populate_catalog(apps, schema_editor):
+    FreelancerProfile = apps.get_model('freelancer', 'FreelancerProfile')
+    Skill = apps.get_model('freelancer', 'Skill')
+    Profession = apps.get_model('freelancer', 'Profession')
+
+    skills = {}
+    professions = {}
+    for profile in FreelancerProfile.objects.all():
+        skill_objs = []
+        for name in parse_list_field(profile.skills):
+            if name[:100] not in skills:
+                skills[name[:100]] = Skill.objects.get_or_create(name=name[:100])[0]
+            skill_objs.append(skills[name[:100]])
+        profession_objs = []
+        for name in parse_list_field(profile.professional_title):
+            if name[:100] not in professions:
+                professions[name[:100]] = Profession.objects.get_or_create(
+                    name=name[:100], defaults={'category': PROFESSION_CATEGORIES.get(name, '')}
+                )[0]
+            profession_objs.append(professions[name[:100]])
+        profile.skill_tags.set(skill_objs)
+        profile.profession_tags.set(profession_objs)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer', '0002_freelancersearchterm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Profession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('category', models.CharField(blank=True, db_index=True, max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='profession_tags',
+            field=models.ManyToManyField(blank=True, related_name='freelancers', to='freelancer.profession'),
+        ),
+        migrations.AddField(
+            model_name='freelancerprofile',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='freelancers', to='freelancer.skill'),
+        ),
+        migrations.RunPython(populate_catalog, migrations.RunPython.noop),
+    ]
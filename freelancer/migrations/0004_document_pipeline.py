@@ -0,0 +1,50 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:49
+
+from django.db import migrations, models
+
+
+def mark_existing_done(apps, schema_editor):
+    # Documents created before the pipeline were processed inside the request
+    Document = apps.get_model('freelancer', 'Document')
+    Document.objects.update(status='done', stage='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer', '0003_skill_profession_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='resume_data',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='resume_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='stage',
+            field=models.CharField(choices=[('extract', 'Extracting text'), ('parse', 'Reading sections'), ('render', 'Building portfolio'), ('thumbnail', 'Taking cover image'), ('done', 'Done')], default='extract', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=10),
+        ),
+        migrations.RunPython(mark_existing_done, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer', '0004_document_pipeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedResume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(upload_to='resume/')),
+                ('resume_text', models.TextField(blank=True, default='')),
+                ('resume_data', models.JSONField(blank=True, null=True)),
+                ('parser_version', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='parsed_resume',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='documents', to='freelancer.parsedresume'),
+        ),
+    ]
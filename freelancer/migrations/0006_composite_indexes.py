@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-19 02:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0004_composite_indexes'),
+        ('freelancer', '0005_parsed_resume'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['project', 'freelancer'], name='freelancer__project_3965b6_idx'),
+        ),
+    ]
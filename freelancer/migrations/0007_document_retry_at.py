@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer', '0006_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='retry_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-19 03:11
+
+from django.db import migrations, models
+
+
+def delete_catalog_terms(apps, schema_editor):
+    # Profession and skill filters now go through the Skill/Profession catalog
+    FreelancerSearchTerm = apps.get_model('freelancer', 'FreelancerSearchTerm')
+    FreelancerSearchTerm.objects.exclude(kind='word').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer', '0007_document_retry_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_catalog_terms, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='freelancersearchterm',
+            name='kind',
+            field=models.CharField(choices=[('word', 'Word')], max_length=10),
+        ),
+    ]
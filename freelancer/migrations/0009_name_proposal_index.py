@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 03:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer', '0008_drop_catalog_search_terms'),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name='proposal',
+            new_name='proposal_project_user_idx',
+            old_name='freelancer__project_3965b6_idx',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('freelancer', '0009_name_proposal_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
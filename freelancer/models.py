@@ -7,6 +7,21 @@ from core.models import CustomUser
     
 from ckeditor.fields import RichTextField
 from django.utils import timezone
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Profession(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    category = models.CharField(max_length=100, blank=True, db_index=True)  # Matching Project.category
+
+    def __str__(self):
+        return self.name
+
+
 class FreelancerProfile(models.Model):
     STATUS_CHOICES = [
         ('active', 'Active'),
@@ -28,10 +43,32 @@ class FreelancerProfile(models.Model):
     aadhaar_document = models.FileField(upload_to='aadhaar/', null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     work_type = models.CharField(max_length=10, choices=WORK_TYPE_CHOICES, default='part_time')
+    # Normalized copies of skills/professional_title, kept in sync by freelancer.catalog
+    skill_tags = models.ManyToManyField(Skill, related_name='freelancers', blank=True)
+    profession_tags = models.ManyToManyField(Profession, related_name='freelancers', blank=True)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
+
+class FreelancerSearchTerm(models.Model):
+    # Inverted index of freelancer profiles, rebuilt by freelancer.search.index_freelancer
+    KIND_CHOICES = [
+        ('word', 'Word'),
+    ]
+
+    profile = models.ForeignKey(FreelancerProfile, on_delete=models.CASCADE, related_name='search_terms')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    term = models.CharField(max_length=100)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('profile', 'kind', 'term')
+        indexes = [models.Index(fields=['kind', 'term'])]
+
+    def __str__(self):
+        return f"{self.kind}:{self.term}"
+
 class Todo(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     title = models.CharField(max_length=50,default=None)
@@ -63,6 +100,9 @@ class Proposal(models.Model):
     fancy_num=models.CharField(max_length=5, unique=True, blank=True)
     proposal_file = models.FileField(upload_to='proposals/', null=True, blank=True)
     locked = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [models.Index(fields=['project', 'freelancer'], name='proposal_project_user_idx')]
     
 
     
@@ -75,13 +115,54 @@ class ProposalFile(models.Model):
 
 from administrator.models import Template
 
+class ParsedResume(models.Model):
+    # One row per distinct resume PDF, shared by every Document made from it
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to='resume/')
+    resume_text = models.TextField(blank=True, default='')
+    resume_data = models.JSONField(null=True, blank=True)
+    parser_version = models.PositiveSmallIntegerField(default=0)  # see freelancer.resume_pipeline.PARSER_VERSION
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Resume {self.sha256[:12]}"
+
+
 class Document(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     resume_file = models.FileField(upload_to='resume/', null=True, blank=True)
+    parsed_resume = models.ForeignKey(ParsedResume, on_delete=models.SET_NULL, null=True, blank=True, related_name='documents')
     portfolio_file = models.FileField(upload_to='portfolios/', null=True, blank=True)
     template = models.ForeignKey(Template, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     cover_image = models.ImageField(upload_to='cover_images/', null=True, blank=True) 
+
+    # Background portfolio generation (freelancer.resume_pipeline)
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    STAGE_CHOICES = [
+        ('extract', 'Extracting text'),
+        ('parse', 'Reading sections'),
+        ('render', 'Building portfolio'),
+        ('thumbnail', 'Taking cover image'),
+        ('done', 'Done'),
+    ]
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    stage = models.CharField(max_length=10, choices=STAGE_CHOICES, default='extract')  # next stage to run
+    resume_text = models.TextField(blank=True, default='')
+    resume_data = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    retry_at = models.DateTimeField(null=True, blank=True)  # a failed stage is not retried before this
+    started_at = models.DateTimeField(null=True, blank=True)  # when the worker started the current stage
     
     def __str__(self):
         return f"{self.user.username} - {self.template.name if self.template else 'No Template'} - {self.id}"
\ No newline at end of file
@@ -0,0 +1,42 @@
+import threading
+
+from django.conf import settings
+
+
+DEFAULT_MODEL = 'en_core_web_sm'
+
+
+class NLPDisabled(Exception):
+    """Raised when a model is requested in a process started with NLP_ENABLED = False."""
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_nlp(name=DEFAULT_MODEL):
+    """
+    The spaCy pipeline `name`, loaded on first use and shared by the process.
+
+    Web workers that never parse resumes can set NLP_ENABLED = False so that
+    nothing imports spaCy or loads a model there. The model must be installed
+    (python -m spacy download en_core_web_sm); it is never downloaded at
+    runtime.
+    """
+    if not getattr(settings, 'NLP_ENABLED', True):
+        raise NLPDisabled(f'spaCy model {name} requested but NLP_ENABLED is False')
+
+    model = _models.get(name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(name)
+            if model is None:
+                import spacy
+                model = _models[name] = spacy.load(name)
+    return model
+
+
+def needs_nlp(stage):
+    # Marks a resume pipeline stage that uses spaCy, so the model is loaded before it runs
+    stage.needs_nlp = True
+    return stage
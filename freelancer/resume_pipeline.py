@@ -0,0 +1,252 @@
+import hashlib
+import logging
+import os
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat
+from django.template import loader
+from django.utils import timezone
+
+from core.models import Register
+from freelancer.models import Document, ParsedResume
+from freelancer.nlp import get_nlp
+from freelancer.screenshots import render_screenshot
+from freelancer.utils import (
+    extract_text_from_pdf, parse_achievements, parse_contact, parse_education, parse_experience,
+    parse_internships, parse_projects, parse_skills, process_resume_text,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Stages decorated with freelancer.nlp.needs_nlp get the spaCy model loaded before they run;
+# the current parsers are rule based, so no stage loads it
+STAGES = ['extract', 'parse', 'render', 'thumbnail']
+
+# A failing stage is retried this many times by the worker before the document is marked failed
+MAX_ATTEMPTS = 3
+
+# Seconds before the first retry of a failed stage; doubled after every further failure
+RETRY_BACKOFF = 30
+
+# A stage still running after this long belongs to a worker that died; it counts as a failed attempt
+STAGE_TIMEOUT = timedelta(minutes=10)
+
+# Bump when the section parsers change so cached ParsedResume data is parsed again
+PARSER_VERSION = 1
+
+
+def file_sha256(uploaded_file):
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def store_resume(uploaded_file):
+    """
+    The ParsedResume of an uploaded PDF, keyed by the SHA-256 of its bytes.
+
+    The file is written to storage (as resume/<sha256>.pdf) only the first
+    time its content is seen; uploading the same resume again reuses the
+    stored file and whatever was already extracted and parsed from it.
+    """
+    digest = file_sha256(uploaded_file)
+    parsed = ParsedResume.objects.filter(sha256=digest).first()
+    if parsed is None:
+        parsed = ParsedResume(sha256=digest)
+        parsed.file.save(f'{digest}.pdf', uploaded_file, save=False)
+        try:
+            with transaction.atomic():
+                parsed.save()
+        except IntegrityError:
+            # Same file uploaded concurrently; keep the other copy
+            parsed.file.delete(save=False)
+            parsed = ParsedResume.objects.get(sha256=digest)
+    return parsed
+
+
+def create_document(user, template, uploaded_file):
+    # New portfolio for the resume; a resume parsed before goes straight to the render stage
+    parsed = store_resume(uploaded_file)
+    document = Document(user=user, template=template, resume_file=parsed.file.name, parsed_resume=parsed)
+    if parsed.resume_data is not None and parsed.parser_version == PARSER_VERSION:
+        document.resume_text = parsed.resume_text
+        document.resume_data = parsed.resume_data
+        document.stage = 'render'
+    document.save()
+    return document
+
+
+def extract(document):
+    parsed = document.parsed_resume
+    if parsed and parsed.resume_text:
+        document.resume_text = parsed.resume_text
+        return ['resume_text']
+
+    with document.resume_file.open('rb') as pdf_file:
+        document.resume_text = extract_text_from_pdf(BytesIO(pdf_file.read()))
+    if parsed:
+        parsed.resume_text = document.resume_text
+        parsed.save(update_fields=['resume_text'])
+    return ['resume_text']
+
+
+def parse(document):
+    parsed = document.parsed_resume
+    if parsed and parsed.resume_data is not None and parsed.parser_version == PARSER_VERSION:
+        document.resume_data = parsed.resume_data
+        return ['resume_data']
+
+    extracted_info = process_resume_text(document.resume_text)
+
+    # Parse sub-details (experience, education, internships, skills, etc.)
+    extracted_info['Experience'] = parse_experience(extracted_info.get('Experience', ''))
+    extracted_info['Education'] = parse_education(extracted_info.get('Education', ''))
+    extracted_info['Internships'] = parse_internships(extracted_info.get('Internships', ''))
+    extracted_info['Projects'] = parse_projects(extracted_info.get('Projects', ''))
+    extracted_info['Technical'] = parse_skills(extracted_info.get('Technical Skills', ''))
+    extracted_info['Personal'] = parse_skills(extracted_info.get('Personal Skills', ''))
+    extracted_info['Contact'] = parse_contact(extracted_info.get('Contact', ''))
+    extracted_info['Achievements'] = parse_achievements(extracted_info.get('Achievements', ''))
+
+    document.resume_data = extracted_info
+    if parsed:
+        parsed.resume_data = extracted_info
+        parsed.parser_version = PARSER_VERSION
+        parsed.save(update_fields=['resume_data', 'parser_version'])
+    return ['resume_data']
+
+
+def render(document):
+    user_details = Register.objects.get(user_id=document.user_id)
+    context = {
+        'resume_data': document.resume_data,
+        'portfolio': document,
+        'name': f"{user_details.first_name} {user_details.last_name}",
+        'bio': user_details.bio_description,
+        'picture': user_details.profile_picture,
+        'user': document.user,
+        'user_details': user_details,
+        'doc_id': document.id,
+    }
+
+    selected_template_path = os.path.join(settings.MEDIA_ROOT, document.template.file.name)
+    rendered_html = loader.get_template(selected_template_path).render(context)
+
+    html_file_name = f'resume_{document.id}.html'
+    html_file_path = os.path.join(settings.MEDIA_ROOT, 'portfolios', html_file_name)
+    os.makedirs(os.path.dirname(html_file_path), exist_ok=True)
+    with open(html_file_path, 'w', encoding='utf-8') as html_file:
+        html_file.write(rendered_html)
+
+    document.portfolio_file = f'portfolios/{html_file_name}'
+    return ['portfolio_file']
+
+
+def thumbnail(document):
+    html_file_path = os.path.join(settings.MEDIA_ROOT, document.portfolio_file.name)
+    document.cover_image.save(f'resume_{document.id}.png', ContentFile(render_screenshot(html_file_path)), save=False)
+    return ['cover_image']
+
+
+STAGE_FUNCTIONS = {'extract': extract, 'parse': parse, 'render': render, 'thumbnail': thumbnail}
+
+
+def progress(document):
+    # Percentage of stages completed
+    if document.stage == 'done':
+        return 100
+    return STAGES.index(document.stage) * 100 // len(STAGES)
+
+
+def run_pipeline(document):
+    """
+    Run the remaining stages of the document, saving after each one.
+
+    `document.stage` is the next stage to run, so after a failure the
+    pipeline picks up at the failed stage and keeps what earlier stages
+    stored (text, parsed sections, portfolio HTML).
+    """
+    while document.stage != 'done':
+        stage = document.stage
+        try:
+            if getattr(STAGE_FUNCTIONS[stage], 'needs_nlp', False):
+                get_nlp()
+            fields = STAGE_FUNCTIONS[stage](document)
+        except Exception as e:
+            logger.exception('Resume stage %s failed for document %s', stage, document.id)
+            document.attempts += 1
+            document.error = f'{stage}: {e}'
+            document.status = Document.STATUS_QUEUED if document.attempts < MAX_ATTEMPTS else Document.STATUS_FAILED
+            document.retry_at = timezone.now() + timedelta(seconds=RETRY_BACKOFF * 2 ** (document.attempts - 1))
+            document.save(update_fields=['attempts', 'error', 'status', 'retry_at'])
+            return False
+
+        index = STAGES.index(stage)
+        document.stage = STAGES[index + 1] if index + 1 < len(STAGES) else 'done'
+        document.started_at = timezone.now()
+        document.save(update_fields=fields + ['stage', 'started_at'])
+
+    document.status = Document.STATUS_DONE
+    document.error = ''
+    document.retry_at = None
+    document.started_at = None
+    document.save(update_fields=['status', 'error', 'retry_at', 'started_at'])
+    return True
+
+
+def requeue_stale_documents(now):
+    # Documents left running by a worker that crashed or was redeployed go back to the queue,
+    # or are marked failed once they have used up their attempts
+    stale = Document.objects.filter(status=Document.STATUS_RUNNING, started_at__lt=now - STAGE_TIMEOUT)
+    changes = {
+        'attempts': F('attempts') + 1,
+        'error': Concat(F('stage'), Value(': the worker stopped before the stage finished')),
+        'started_at': None,
+        'retry_at': None,
+    }
+    stale.filter(attempts__gte=MAX_ATTEMPTS - 1).update(status=Document.STATUS_FAILED, **changes)
+    stale.update(status=Document.STATUS_QUEUED, **changes)
+
+
+def claim_next_document():
+    # The conditional UPDATE makes sure two workers never process the same document;
+    # documents waiting out the backoff after a failed stage are skipped
+    now = timezone.now()
+    requeue_stale_documents(now)
+    queued = Document.objects.filter(
+        Q(retry_at__isnull=True) | Q(retry_at__lte=now), status=Document.STATUS_QUEUED,
+    ).order_by('created_at', 'id')
+    for document_id in queued.values_list('id', flat=True)[:10]:
+        claimed = Document.objects.filter(id=document_id, status=Document.STATUS_QUEUED).update(
+            status=Document.STATUS_RUNNING, started_at=now,
+        )
+        if claimed:
+            return Document.objects.select_related('template', 'user', 'parsed_resume').get(id=document_id)
+    return None
+
+
+def run_pending_documents():
+    # Processes queued documents until none are left; returns how many runs were made
+    count = 0
+    while True:
+        document = claim_next_document()
+        if document is None:
+            return count
+        run_pipeline(document)
+        count += 1
+
+
+def retry(document):
+    # Queue a failed document again; completed stages are not redone
+    document.status = Document.STATUS_QUEUED
+    document.attempts = 0
+    document.retry_at = None
+    document.save(update_fields=['status', 'attempts', 'retry_at'])
@@ -0,0 +1,178 @@
+import atexit
+import functools
+import io
+import logging
+import queue
+import re
+import threading
+import time
+from html import unescape
+
+from django.conf import settings
+from PIL import Image, ImageDraw, ImageFont
+
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_SIZE = (1024, 768)
+
+
+class ScreenshotUnavailable(Exception):
+    """No browser can take the screenshot right now."""
+
+
+@functools.lru_cache(maxsize=1)
+def _chromedriver_path():
+    # Resolved once per process instead of on every screenshot
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+class ChromePool:
+    """
+    A bounded set of long-lived headless Chrome sessions.
+
+    At most `size` browsers exist at once; a render waits up to
+    `wait_timeout` seconds for a free one and a page gets `render_timeout`
+    seconds to load. Browsers are reused across renders and replaced after
+    `max_uses` renders or as soon as one fails, so a hung or leaking session
+    never stays in the pool. When Chrome cannot be started at all, renders
+    fail fast for `retry_after` seconds instead of retrying every time.
+    """
+
+    def __init__(self, size=2, render_timeout=20, wait_timeout=30, max_uses=50, retry_after=300):
+        self.render_timeout = render_timeout
+        self.wait_timeout = wait_timeout
+        self.max_uses = max_uses
+        self.retry_after = retry_after
+        self._unavailable_until = 0
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._all = set()
+        self._lock = threading.Lock()
+
+    def _start_browser(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service as ChromeService
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        driver = webdriver.Chrome(service=ChromeService(_chromedriver_path()), options=chrome_options)
+        driver.set_page_load_timeout(self.render_timeout)
+        driver.set_script_timeout(self.render_timeout)
+        driver.set_window_size(*SCREENSHOT_SIZE)
+        with self._lock:
+            self._all.add(driver)
+        return [driver, 0]
+
+    def _discard(self, browser):
+        with self._lock:
+            self._all.discard(browser[0])
+        try:
+            browser[0].quit()
+        except Exception:
+            pass
+
+    def render(self, html_path):
+        if time.monotonic() < self._unavailable_until:
+            raise ScreenshotUnavailable('Chrome could not be started recently')
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise ScreenshotUnavailable('All browsers are busy')
+        try:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                try:
+                    browser = self._start_browser()
+                except Exception:
+                    self._unavailable_until = time.monotonic() + self.retry_after
+                    raise
+
+            try:
+                browser[0].get(f'file://{html_path}')
+                png = browser[0].get_screenshot_as_png()
+            except Exception:
+                self._discard(browser)
+                raise
+
+            browser[1] += 1
+            if browser[1] >= self.max_uses:
+                self._discard(browser)
+            else:
+                self._idle.put(browser)
+            return png
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def _page_text(html):
+    # Title and first heading of the page, for the fallback cover
+    def first(pattern):
+        match = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
+        return unescape(re.sub(r'<[^>]+>', '', match.group(1))).strip() if match else ''
+    return first(r'<title[^>]*>(.*?)</title>'), first(r'<h1[^>]*>(.*?)</h1>')
+
+
+def render_fallback(html_path):
+    """Plain cover image drawn with Pillow, for when no browser is available."""
+    with open(html_path, encoding='utf-8') as html_file:
+        title, heading = _page_text(html_file.read())
+
+    image = Image.new('RGB', SCREENSHOT_SIZE, '#f4f6f9')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, SCREENSHOT_SIZE[0], 120], fill='#ff0057')
+    font = ImageFont.load_default()
+    draw.text((40, 50), heading or title or 'Portfolio', fill='white', font=font)
+    if title and heading and title != heading:
+        draw.text((40, 160), title, fill='#333333', font=font)
+
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    # One pool per process, sized by settings.SCREENSHOT_POOL_SIZE
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ChromePool(
+                    size=getattr(settings, 'SCREENSHOT_POOL_SIZE', 2),
+                    render_timeout=getattr(settings, 'SCREENSHOT_TIMEOUT', 20),
+                )
+                atexit.register(_pool.close)
+    return _pool
+
+
+def render_screenshot(html_path):
+    """
+    PNG bytes of the HTML file at `html_path`.
+
+    Uses the shared Chrome pool unless settings.SCREENSHOT_RENDERER is
+    'fallback'; when Chrome is missing, busy or times out the Pillow
+    fallback cover is returned instead.
+    """
+    if getattr(settings, 'SCREENSHOT_RENDERER', 'chrome') == 'chrome':
+        try:
+            return get_browser_pool().render(html_path)
+        except Exception as e:
+            logger.warning('Chrome screenshot of %s failed, using the fallback renderer: %s', html_path, e)
+    return render_fallback(html_path)
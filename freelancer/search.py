@@ -0,0 +1,111 @@
+import re
+
+from django.db.models import Q, Sum
+
+from freelancer.models import FreelancerProfile, FreelancerSearchTerm
+
+
+# Keeps names like c++ and c# intact; node.js and html/css are split into words
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# Relevance of a query word found in each part of the profile
+NAME_WEIGHT = 4
+PROFESSION_WEIGHT = 3
+SKILL_WEIGHT = 2
+
+
+def parse_list_field(value):
+    # skills and professional_title are stored as the str() of a Python list
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        items = value.strip('[]').replace("'", "").split(', ') if value else []
+    return [item.strip() for item in items if item and item.strip()]
+
+
+def normalize(text):
+    return ' '.join(text.lower().split())
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def build_terms(username, first_name, last_name, professional_title, skills):
+    """
+    Index entries of one profile as (kind, term, weight) tuples: every word
+    of the name, professions and skills under 'word' for free-text search.
+    The profession and skill filters use the catalog (freelancer.catalog).
+    """
+    terms = {}
+
+    def add(kind, term, weight):
+        term = term[:100]
+        if term and terms.get((kind, term), 0) < weight:
+            terms[(kind, term)] = weight
+
+    for text in (username, first_name, last_name):
+        for token in tokenize(text):
+            add('word', token, NAME_WEIGHT)
+    for profession in parse_list_field(professional_title):
+        for token in tokenize(profession):
+            add('word', token, PROFESSION_WEIGHT)
+    for skill in parse_list_field(skills):
+        for token in tokenize(skill):
+            add('word', token, SKILL_WEIGHT)
+
+    return [(kind, term, weight) for (kind, term), weight in terms.items()]
+
+
+def index_freelancer(profile):
+    user = profile.user
+    register = getattr(user, 'register', None)
+    terms = build_terms(
+        user.username,
+        register.first_name if register else '',
+        register.last_name if register else '',
+        profile.professional_title,
+        profile.skills,
+    )
+    FreelancerSearchTerm.objects.filter(profile=profile).delete()
+    FreelancerSearchTerm.objects.bulk_create([
+        FreelancerSearchTerm(profile=profile, kind=kind, term=term, weight=weight)
+        for kind, term, weight in terms
+    ])
+
+
+def search_freelancers(query='', profession='', skill=''):
+    """
+    Freelancer profiles matching the search box and filters.
+
+    Query words match indexed words by prefix and results are ranked by the
+    summed weight of the matches (name > profession > skill). Profession and
+    skill filters match a catalog name, ignoring case.
+    """
+    profiles = FreelancerProfile.objects.filter(
+        user__role='freelancer', professional_title__isnull=False
+    ).exclude(professional_title='').select_related('user', 'user__register').prefetch_related(
+        'profession_tags', 'skill_tags'
+    )
+
+    if profession:
+        profiles = profiles.filter(id__in=FreelancerProfile.profession_tags.through.objects.filter(
+            profession__name__iexact=normalize(profession)
+        ).values('freelancerprofile_id'))
+
+    if skill:
+        profiles = profiles.filter(id__in=FreelancerProfile.skill_tags.through.objects.filter(
+            skill__name__iexact=normalize(skill)
+        ).values('freelancerprofile_id'))
+
+    tokens = tokenize(query)
+    if not tokens:
+        return profiles.order_by('id')
+
+    match = Q()
+    for token in tokens:
+        match |= Q(search_terms__term__startswith=token)
+
+    return profiles.annotate(
+        score=Sum('search_terms__weight', filter=Q(search_terms__kind='word') & match)
+    ).filter(score__gt=0).order_by('-score', 'id')
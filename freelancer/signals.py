@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.models import Register
+from freelancer.models import FreelancerProfile
+from freelancer.catalog import sync_profile_tags
+from freelancer.search import index_freelancer
+
+
+@receiver(post_save, sender=FreelancerProfile)
+def reindex_freelancer_profile(sender, instance, **kwargs):
+    index_freelancer(instance)
+    sync_profile_tags(instance)
+
+
+@receiver(post_save, sender=Register)
+def reindex_freelancer_name(sender, instance, **kwargs):
+    profile = FreelancerProfile.objects.filter(user_id=instance.user_id).first()
+    if profile:
+        index_freelancer(profile)
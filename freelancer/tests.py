@@ -0,0 +1,26 @@
+from core.tests import QueryBudgetTestCase, QueryPlanTestCase
+from freelancer.models import Proposal
+
+
+class FreelancerQueryPlanTests(QueryPlanTestCase):
+    def test_proposal_of_freelancer_for_project(self):
+        self.assertIndexed(Proposal.objects.filter(project_id=1, freelancer_id=2), 'proposal_project_user_idx')
+
+    def test_proposals_of_project(self):
+        self.assertIndexed(Proposal.objects.filter(project_id=1, status='Accepted'))
+
+
+class FreelancerQueryBudgetTests(QueryBudgetTestCase):
+    def test_freelancer_view(self):
+        self.get('freelancer0', '/freelancer/freelancer_view/')
+
+    def test_view_project(self):
+        self.get('freelancer0', '/freelancer/view_project/')
+
+    def test_project_feed_api(self):
+        response = self.get('freelancer0', '/freelancer/project_feed/')
+        self.assertTrue(response.json()['success'])
+        self.assertIn('no-store', response['Cache-Control'])
+
+        self.login('client0')
+        self.assertEqual(self.client.get('/freelancer/project_feed/').status_code, 403)
@@ -1,5 +1,4 @@
 import fitz  # PyMuPDF
-import spacy
 import json
 import re
 from django.shortcuts import render, redirect, get_object_or_404
@@ -7,15 +6,6 @@ from django.http import HttpResponse
 from io import BytesIO
 from .models import Document, Template  # Adjust import based on your project structure
 
-# Load spaCy's English NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    # Download the model if it isn't found
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
-
 # Function to clean unnecessary icons and whitespace
 def clean_text(text):
     text = text.replace('\uf0b7', '')  # Remove unnecessary icons
@@ -31,9 +21,9 @@ def extract_text_from_pdf(pdf_stream):
         text += page.get_text()
     return text
 
-# Step 2: Process resume text to extract structured information using NLP
+# Step 2: Process resume text to extract structured information by section headings
+# (rule based; spaCy models are available through freelancer.nlp.get_nlp when needed)
 def process_resume_text(resume_text):
-    doc = nlp(resume_text)
     headings = ["Experience", "Education", "Technical Skills", "Personal Skills", "Projects", "Certifications", "Achievements", "Hobbies", "Internships", "Contact"]
     extracted_info = {heading: "" for heading in headings}
     current_heading = None
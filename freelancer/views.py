@@ -11,7 +11,12 @@ import os
 from django.shortcuts import get_object_or_404, redirect, render
 
 from client.models import Message,ClientProfile, FreelanceContract, PaymentInstallment, Project, Review,SharedFile, SharedNote,SharedURL,Repository, Task,Complaint
-from core.decorators import nocache
+from core.decorators import nocache, query_budget
+from core.viewer import get_viewer
+from core.display_names import display_name, display_names
+from client.progress import project_progress
+from freelancer.catalog import projects_for_freelancer
+from freelancer.feed import project_feed
 from core.models import CustomUser, Event, Notification, Register
 
 from django.contrib.auth.decorators import login_required
@@ -41,6 +46,7 @@ from django.db.models.functions import TruncMonth
 
 @login_required
 @nocache
+@query_budget(30)
 def freelancer_view(request):
     if 'uid' not in request.session and not request.user.is_authenticated and request.user.role != 'freelancer':
         return redirect('login')
@@ -48,9 +54,10 @@ def freelancer_view(request):
     uid = request.session['uid']
     logged_user = request.user
     uid = request.user.id
-    profile2 = Register.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile2 = viewer.profile
     todos = Todo.objects.filter(user_id=uid)
-    profile1 = CustomUser.objects.get(id=uid)
+    profile1 = viewer.user
     notifications = Notification.objects.filter(user=logged_user).order_by('-created_at')[:5]
 
     current_date = timezone.now().date()
@@ -61,58 +68,14 @@ def freelancer_view(request):
         start_time__range=[current_date, one_week_later]
     ).order_by('start_time')
 
-    total_projects = Project.objects.filter(freelancer=logged_user).count()
-    completed_projects = Project.objects.filter(freelancer=logged_user, project_status='Completed').count()
-    not_completed_projects = total_projects - completed_projects
-
-    for event in events:
-        one_day_before = event.start_time.date() - timedelta(days=1)
-        
-        if one_day_before == current_date:
-            notification_message = f"Reminder: Upcoming event '{event.title}' tomorrow!"
-            Notification.objects.get_or_create(
-                user=logged_user,
-                message=notification_message,
-                defaults={'is_read': False}
-            )
-        
-        if event.start_time.date() == current_date:
-            notification_message = f"Reminder: Event '{event.title}' is today!"
-            Notification.objects.get_or_create(
-                user=logged_user,
-                message=notification_message,
-                defaults={'is_read': False}
-            )
-    freelancer_projects = Project.objects.filter(freelancer=logged_user)
-    project_progress_data = []
-
-    for project in freelancer_projects:
-        tasks = Task.objects.filter(project=project)
-        total_tasks = tasks.count()
-        completed_tasks = tasks.filter(status='Completed').count()
-        progress_percentage = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0.0
-
-        if progress_percentage == 100:
-            project.project_status = 'Completed'
-            project.save()
-        
-        client_profile = ClientProfile.objects.get(user=project.user_id)
-        if client_profile.client_type == 'Individual':
-            register_instance = Register.objects.get(user=project.user_id)
+    # Event reminders are created by the send_reminders management command
 
-            first_name = register_instance.first_name
-            last_name = register_instance.last_name
+    # Task counts and client names for every project come from one annotated query
+    project_progress_data = project_progress(Project.objects.filter(freelancer=logged_user))
 
-            client_name = f"{first_name} {last_name}"
-        else:
-            client_name = client_profile.company_name
-        project_progress_data.append({
-            'project': project,
-            'progress_percentage': progress_percentage,
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'client_name': client_name  
-        })
+    total_projects = len(project_progress_data)
+    completed_projects = sum(1 for data in project_progress_data if data['project'].project_status == 'Completed')
+    not_completed_projects = total_projects - completed_projects
         
     if logged_user.is_authenticated and profile2 and not any([
         profile2.phone_number or '',
@@ -170,9 +133,10 @@ def tasks_list(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
     if profile1.permission:
         
@@ -278,19 +242,13 @@ def account_settings(request):
     "coreldraw", "affinity designer", "adobe photoshop", "adobe indesign", "canva", "opencv"
 ]
 
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     todos = Todo.objects.filter(user_id=uid)
-    if freelancer.professional_title:
-        freelancer.professional_title = freelancer.professional_title.strip('[]').replace("'", "").split(', ')
-    else:
-        freelancer.professional_title = []
-
-    if freelancer.skills:
-        freelancer.skills = freelancer.skills.strip('[]').replace("'", "").split(', ')
-    else:
-        freelancer.skills = []
+    freelancer.professional_title = [profession.name for profession in freelancer.profession_tags.all()]
+    freelancer.skills = [skill.name for skill in freelancer.skill_tags.all()]
     return render(request, 'freelancer/accounts.html',{'profile1':profile1,
                                                        'profile2':profile2,
                                                        
@@ -321,9 +279,10 @@ def change_password(request, uid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     todos = Todo.objects.filter(user_id=uid)
 
     if request.method == 'POST':
@@ -361,9 +320,10 @@ def update_profile(request,uid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     todos = Todo.objects.filter(user_id=uid)
     
     if request.method == 'POST':
@@ -417,9 +377,10 @@ def change_profile_image(request,uid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     todos = Todo.objects.filter(user_id=uid)
     if request.method=='POST':
         
@@ -441,9 +402,10 @@ def client_list(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
     if profile1.permission:
         todos = Todo.objects.filter(user_id=uid)
@@ -502,9 +464,10 @@ def client_detail(request, cid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         profile3 = CustomUser.objects.get(id=cid)
@@ -559,9 +522,10 @@ def calendar(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    client = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    client = viewer.freelancer
     events = Event.objects.filter(user=uid)
     events_data = [
         {
@@ -605,8 +569,9 @@ def add_new_event(request):
     if not uid:
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=uid)
-    profile2 = get_object_or_404(Register, user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     freelancer = get_object_or_404(FreelancerProfile, user_id=uid)
 
     if profile1.permission:
@@ -644,8 +609,9 @@ def update_event(request):
         return redirect('login')
 
     uid = request.session.get('uid')
-    profile1 = get_object_or_404(CustomUser, id=uid)
-    profile2 = get_object_or_404(Register, user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     freelancer = get_object_or_404(FreelancerProfile, user_id=uid)
 
     if profile1.permission:
@@ -691,8 +657,9 @@ def delete_event(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = get_object_or_404(CustomUser, id=uid)
-    profile2 = get_object_or_404(Register, user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     freelancer = get_object_or_404(FreelancerProfile, user_id=uid)
 
     if profile1.permission:
@@ -730,9 +697,10 @@ def todo(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission==True:
         todos = Todo.objects.filter(user_id=uid)
@@ -749,9 +717,10 @@ def add_todo(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission==True:
         if request.method=='POST':
@@ -775,9 +744,10 @@ def update_todo(request):
     if uid is None:
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
     if profile1.permission:
         if request.method == 'POST':
@@ -809,9 +779,10 @@ def delete_todo(request, todo_id):
     if uid is None:
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         if request.method == 'POST':
@@ -837,81 +808,48 @@ def delete_todo(request, todo_id):
                
         
 
-@login_required
-@nocache
-def view_project(request):
-    if 'uid' not in request.session:
-        return redirect('login')
-
-    uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
-
-    # Mapping professions to corresponding categories
-    profession_category_map = {
-        'Web Developer': 'Web Development',
-        'Front-End Developer': 'Front-End Development',
-        'Back-End Developer': 'Back-End Development',
-        'Full-Stack Developer': 'Full-Stack Development',
-        'Mobile App Developer': 'Mobile Development',
-        'Android Developer': 'Android Development',
-        'iOS Developer': 'iOS Development',
-        'UI/UX Designer': 'UI/UX Design',
-        'Graphic Designer': 'Graphic Design',
-        'Logo Designer': 'Logo Design',
-        'Poster Designer': 'Poster Design',
-        'Machine Learning Engineer': 'Machine Learning Engineering',
-        'Artificial Intelligence Specialist': 'Artificial Intelligence',
-        'Software Developer': 'Software Development'
-    }
-
-    if profile1.permission:
-        professions = []
-        if freelancer and freelancer.professional_title:
-            professions = freelancer.professional_title.strip('[]').replace("'", "").split(', ')
-
-        profession_categories = [profession_category_map.get(profession) for profession in professions if profession in profession_category_map]
+def filtered_projects(request, freelancer):
+    search = request.GET.get('search', '')
+    filter_type = request.GET.get('filter_type', '')
+    status = request.GET.get('status', '')
+    cat = request.GET.get('category', '')
 
-        todos = Todo.objects.filter(user_id=uid)
+    projects = Project.objects.all()
 
-        search = request.GET.get('search', '')
-        filter_type = request.GET.get('filter_type', '')
-        status = request.GET.get('status', '')
-        cat = request.GET.get('category', '')
+    # Only projects in the categories of the freelancer's professions, when any are known
+    if freelancer and freelancer.profession_tags.exclude(category='').exists():
+        projects = projects_for_freelancer(freelancer)
 
+    if search:
+        projects = projects.filter(Q(title__icontains=search) | Q(category__icontains=search))
 
-        projects = Project.objects.all()
+    if filter_type == 'category' and cat:
+        projects = projects.filter(category=cat)
 
-        if profession_categories:
-            query = Q()
-            for category in profession_categories:
-                query |= Q(category=category)
-            projects = projects.filter(query)
+    if filter_type == 'status' and status:
+        projects = projects.filter(status=status)
 
-        if search:
-            projects = projects.filter(Q(title__icontains=search) | Q(category__icontains=search))
+    return projects
 
-        if filter_type == 'category' and cat:
-            projects = projects.filter(category=cat)
 
-        if filter_type == 'status' and status:
-            projects = projects.filter(status=status)
+@login_required
+@nocache
+@query_budget(30)
+def view_project(request):
+    if 'uid' not in request.session:
+        return redirect('login')
 
-        project_details = []
-        for project in projects:
-            cid = project.user_id
-            client_profile = ClientProfile.objects.get(user_id=cid)
-            client_register = Register.objects.get(user_id=cid)
+    uid = request.session['uid']
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
-            has_proposal = Proposal.objects.filter(project_id=project.id, freelancer_id=uid).exists()
+    if profile1.permission:
+        todos = Todo.objects.filter(user_id=uid)
 
-            project_details.append({
-                'project': project,
-                'client_profile': client_profile,
-                'client_register': client_register,
-                'has_proposal': has_proposal  # Pass proposal status to template
-            })
+        projects = filtered_projects(request, freelancer)
+        project_details, next_cursor = project_feed(projects, uid, request.GET.get('cursor'))
 
         categories = [
             "Web Development", "Front-End Development", "Back-End Development", "Full-Stack Development", "Mobile Development",
@@ -925,6 +863,7 @@ def view_project(request):
             'freelancer': freelancer,
             'todos': todos,
             'project_details': project_details,
+            'next_cursor': next_cursor,
             'categories': categories
         })
     else:
@@ -935,6 +874,38 @@ def view_project(request):
         })
 
 
+@login_required
+@nocache
+def project_feed_api(request):
+    # JSON version of the project board; pass next_cursor back as ?cursor= for the next page
+    if not request.user.is_authenticated or request.user.role != 'freelancer':
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+
+    viewer = get_viewer(request)
+    if not viewer.user.permission:
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+
+    projects = filtered_projects(request, viewer.freelancer)
+    project_details, next_cursor = project_feed(projects, viewer.user.id, request.GET.get('cursor'))
+
+    return JsonResponse({
+        'success': True,
+        'projects': [{
+            'id': detail['project'].id,
+            'title': detail['project'].title,
+            'description': detail['project'].description,
+            'budget': detail['project'].budget,
+            'category': detail['project'].category,
+            'status': detail['project'].status,
+            'end_date': detail['project'].end_date.isoformat() if detail['project'].end_date else None,
+            'created_at': detail['project'].created_at.isoformat(),
+            'client_name': detail['client_name'],
+            'has_proposal': detail['has_proposal'],
+        } for detail in project_details],
+        'next_cursor': next_cursor,
+    })
+
+
   
   
   
@@ -944,8 +915,9 @@ def single_project_view(request, pid):
     uid = request.user.id  # Use request.user.id to get the logged-in user's ID
     
     # Fetch user profiles and project
-    profile1 = get_object_or_404(CustomUser, id=uid)
-    profile2 = get_object_or_404(Register, user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     freelancer = get_object_or_404(FreelancerProfile, user_id=uid)
     
     if profile1.permission:
@@ -983,9 +955,10 @@ def add_new_proposal(request,pid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission==True:
         todos = Todo.objects.filter(user_id=uid)
@@ -1023,32 +996,25 @@ def proposal_list(request):
     if uid is None:
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         todos = Todo.objects.filter(user_id=uid)
         
         proposals = Proposal.objects.filter(freelancer_id=uid).select_related('project')
         
+        client_names = display_names(proposal.project.user_id for proposal in proposals)
+
         project_details = []
         for proposal in proposals:
             project = proposal.project
-            client_profile = ClientProfile.objects.get(user_id=project.user_id)
-            reg = Register.objects.get(user_id=project.user_id)
-            
-            print(f"Proposal: {proposal}, Project: {project}, Client: {reg.first_name} {reg.last_name}")
-
-            if client_profile.client_type == 'Individual':
-                client_name = f"{reg.first_name} {reg.last_name}"
-            else:
-                client_name = client_profile.company_name
-            
             project_details.append({
                 'proposal': proposal,
                 'project': project,
-                'client_name': client_name
+                'client_name': client_names.get(project.user_id)
             })
         
         return render(request, 'freelancer/Proposals.html', {
@@ -1076,9 +1042,10 @@ def generate_proposal(request,pid):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission==True:
         todos = Todo.objects.filter(user_id=uid)
@@ -1123,9 +1090,10 @@ def proposal_detail1(request, prop_id):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     proposal = get_object_or_404(Proposal, id=prop_id)
     project = Project.objects.get(id=proposal.project_id)
     client_profile = ClientProfile.objects.get(user_id=project.user_id)
@@ -1180,9 +1148,10 @@ def proposal_detail2(request, prop_id):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     proposal = get_object_or_404(Proposal, id=prop_id)
     project = Project.objects.get(id=proposal.project_id)
     client_profile = ClientProfile.objects.get(user_id=project.user_id)
@@ -1220,9 +1189,10 @@ def view_created_proposals(request):
     if uid is None:
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         todos = Todo.objects.filter(user_id=uid)
@@ -1278,9 +1248,10 @@ def edit_created_proposal(request, prop_id):
     if uid is None:
         return redirect('login')
 
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     proposal = get_object_or_404(Proposal, id=prop_id)
     project = Project.objects.get(id=proposal.project_id)
     client_profile = ClientProfile.objects.get(user_id=project.user_id)
@@ -1349,9 +1320,10 @@ def download_proposal_pdf(request, prop_id):
         return redirect('login')
 
     proposal = Proposal.objects.get(id=prop_id)
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
     
     template_path = 'freelancer/proposal_preview.html'  
@@ -1419,20 +1391,16 @@ def view_repository(request, repo_id):
         return redirect('login')
 
     uid = request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
         project = get_object_or_404(Project, id=repository.project_id)
-        client_profile = ClientProfile.objects.get(user_id=project.user_id)
         client_register = Register.objects.get(user_id=project.user_id)
-        
-        if client_profile.client_type == 'Individual':
-            client_name = f"{client_register.first_name} {client_register.last_name}"
-        else:
-            client_name = client_profile.company_name
+        client_name = display_name(project.user_id)
         
         client_profile_picture = client_register.profile_picture if client_register.profile_picture else None
 
@@ -1504,9 +1472,10 @@ def add_file(request, repo_id):
         return redirect('login')
 
     uid = request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1537,9 +1506,10 @@ def add_url(request, repo_id):
         return redirect('login')
 
     uid = request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1570,9 +1540,10 @@ def add_note(request, repo_id):
         return redirect('login')
 
     uid = request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         repository = get_object_or_404(Repository, id=repo_id)
@@ -1604,9 +1575,10 @@ def update_freelancer_signature(request):
         return redirect('login')
 
     uid = request.user.id
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         if request.method == 'POST':
@@ -1637,9 +1609,10 @@ def view_contract(request, cont_id):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
     if profile1.permission:
         contract = FreelanceContract.objects.filter(id=cont_id).first()
@@ -1767,6 +1740,7 @@ def submit_user_review(request):
 
 
 from client.models import ChatRoom 
+from client.chat import fetch_room_messages, publish_message
 
 @login_required
 @nocache
@@ -1775,9 +1749,10 @@ def chat_view(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
     if profile1.permission: 
         
@@ -1847,6 +1822,7 @@ def send_message(request):
                 content=content,
                 sender=request.user
             )
+            publish_message(message)
 
             return JsonResponse({'success': True, 'message': message.content, 'sender': message.sender.username, 'timestamp': message.timestamp.isoformat()}, status=200)
         except Exception as e:
@@ -1866,25 +1842,17 @@ def fetch_messages(request):
         data = json.loads(request.body)
         chat_room_id = data.get('chat_room_id')
 
-        # Fetch messages for the given chat room
-        messages = Message.objects.filter(chat_room_id=chat_room_id).order_by('timestamp')
-
-        # Prepare messages for response
-        messages_list = []
-        for message in messages:
-            print(f"Message ID: {message.id}, Content: {message.content}, Image: {message.image}, File: {message.file}")  # Debugging line
-
-            msg_data = {
-                'content': message.content if message.content else '',  # Ensure content is not None
-                'type': 'sent' if message.sender == request.user else 'received',
-                'image': message.image.url if message.image and hasattr(message.image, 'url') else None,  # Check if image exists
-                'file': message.file.url if message.file and hasattr(message.file, 'url') else None,    # Check if file exists
-            }
-            messages_list.append(msg_data)
+        # Only messages newer than the client's last seen message are returned
+        try:
+            after_id = int(data.get('after_id') or 0)
+        except (TypeError, ValueError):
+            after_id = 0
 
-        print(messages_list)  # Debugging line to check the messages list
+        messages_list, last_id = fetch_room_messages(
+            chat_room_id, request.user, after_id=after_id, since=data.get('since')
+        )
 
-        return JsonResponse({'success': True, 'messages': messages_list})
+        return JsonResponse({'success': True, 'messages': messages_list, 'last_id': last_id})
 
     return JsonResponse({'success': False, 'error': 'Invalid request method.'})
 
@@ -1918,6 +1886,7 @@ def send_file(request):
                 )
 
             message.save()  # Save the message with the file
+            publish_message(message)
 
             return JsonResponse({'success': True, 'message': 'File uploaded successfully.'})
         except Exception as e:
@@ -1934,9 +1903,10 @@ def add_complaint(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2 = Register.objects.get(user_id=uid)
-    freelancer = FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
 
     
     if profile1.permission:
@@ -2005,9 +1975,10 @@ def template_list(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission==True:
         templates = Template.objects.all()  # Fetch all templates from the database
@@ -2017,7 +1988,6 @@ def template_list(request):
         
     
     
-from .utils import extract_text_from_pdf, parse_achievements,process_resume_text, parse_skills,parse_projects,parse_contact,parse_education,parse_experience,parse_internships
 
 from django.http import HttpResponse
 from django.shortcuts import render, redirect
@@ -2034,95 +2004,49 @@ from django.conf import settings
 import os
 from django.core.files.base import ContentFile
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
 from django.core.files.base import ContentFile
+from django.urls import reverse
+from freelancer import resume_pipeline
 
 def process_resume(request, document_id):
     document = get_object_or_404(Document, id=document_id)
-    user = request.user
-    user_details = Register.objects.get(user=user)
-    name = f"{user_details.first_name} {user_details.last_name}"
-    bio = user_details.bio_description
-    profile_picture = user_details.profile_picture
 
     if not document.resume_file:
         return HttpResponse("Resume file not found", status=404)
 
-    try:
-        file_path = document.resume_file.path  # Get the file path
-        with open(file_path, 'rb') as pdf_file:
-            pdf_stream = BytesIO(pdf_file.read())
-            resume_text = extract_text_from_pdf(pdf_stream)
-    except Exception as e:
-        return HttpResponse(f"Error processing PDF: {e}", status=500)
-
-    # Extract resume information
-    extracted_info = process_resume_text(resume_text)
-
-    # Parse sub-details (experience, education, internships, skills, etc.)
-    extracted_info['Experience'] = parse_experience(extracted_info.get('Experience', ''))
-    extracted_info['Education'] = parse_education(extracted_info.get('Education', ''))
-    extracted_info['Internships'] = parse_internships(extracted_info.get('Internships', ''))
-    extracted_info['Projects'] = parse_projects(extracted_info.get('Projects', ''))
-    extracted_info['Technical'] = parse_skills(extracted_info.get('Technical Skills', ''))
-    extracted_info['Personal'] = parse_skills(extracted_info.get('Personal Skills', ''))
-    extracted_info['Contact'] = parse_contact(extracted_info.get('Contact', ''))
-    extracted_info['Achievements'] = parse_achievements(extracted_info.get('Achievements', ''))
-
-    context = {
-        'resume_data': extracted_info,
-        'portfolio': document,
-        'name': name,
-        'bio': bio,
-        'picture': profile_picture,
-        'user': user,
-        'user_details': user_details,
-        'doc_id': document_id,
-    }
-
-    selected_template_path = os.path.join(settings.MEDIA_ROOT, document.template.file.name)
-
-    try:
-        template = loader.get_template(selected_template_path)
-        rendered_html = template.render(context, request)
-
-        html_file_name = f'resume_{document_id}.html'
-        html_file_path = os.path.join(settings.MEDIA_ROOT, 'portfolios', html_file_name)
-        os.makedirs(os.path.dirname(html_file_path), exist_ok=True)
-
-        with open(html_file_path, 'w', encoding='utf-8') as html_file:
-            html_file.write(rendered_html)
-
-        # Set up Selenium with headless Chrome
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
+    # The portfolio is built by the resume worker (freelancer.resume_pipeline); until it
+    # is ready this page polls resume_status and reloads itself
+    if document.status != Document.STATUS_DONE:
+        return render(request, 'freelancer/ResumeProcessing.html', {
+            'document': document,
+            'status_url': reverse('freelancer:resume_status', args=[document.id]),
+            'retry_url': reverse('freelancer:retry_resume', args=[document.id]),
+        })
 
-        # Load the HTML file in the browser
-        driver.get(f'file://{html_file_path}')
-        driver.set_window_size(1024, 768)  
+    with document.portfolio_file.open('rb') as html_file:
+        rendered_html = html_file.read()
+    return HttpResponse(rendered_html, content_type='text/html')
 
-        # Capture the screenshot
-        img_file_name = f'resume_{document_id}.png'
-        img_file_path = os.path.join(settings.MEDIA_ROOT, 'portfolios', img_file_name)
-        driver.save_screenshot(img_file_path)
-        driver.quit()
 
-        # Save the image to the cover_image field
-        with open(img_file_path, 'rb') as img_file:
-            document.cover_image.save(img_file_name, ContentFile(img_file.read()))
+@login_required
+def resume_status(request, document_id):
+    document = get_object_or_404(Document, id=document_id, user=request.user)
+    return JsonResponse({
+        'status': document.status,
+        'stage': document.stage,
+        'stage_label': document.get_stage_display(),
+        'progress': resume_pipeline.progress(document),
+        'error': document.error if document.status == Document.STATUS_FAILED else '',
+    })
 
-        document.portfolio_file = f'portfolios/{html_file_name}'
-        document.save()
 
-        return HttpResponse(rendered_html, content_type='text/html') 
-    except Exception as e:
-        return HttpResponse(f"Error loading template: {e}", status=500)
+@login_required
+def retry_resume(request, document_id):
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
+    document = get_object_or_404(Document, id=document_id, user=request.user, status=Document.STATUS_FAILED)
+    resume_pipeline.retry(document)
+    return JsonResponse({'success': True})
 
 
 
@@ -2141,14 +2065,10 @@ def upload_resume(request):
             except Template.DoesNotExist:
                 return HttpResponse("Template not found", status=404)
 
-            # Save the resume file
-            document = Document.objects.create(
-                user=request.user,
-                resume_file=resume_file,
-                template=template
-            )
+            # Save the resume file (stored once per distinct PDF, see resume_pipeline.store_resume)
+            document = resume_pipeline.create_document(request.user, template, resume_file)
 
-            # Redirect to a new URL to process the resume
+            # The resume worker builds the portfolio; process_resume shows its progress
             return redirect('freelancer:process_resume', document_id=document.id)
 
     return redirect("freelancer:template_list")
@@ -2179,9 +2099,10 @@ def my_portfolios(request):
         return redirect('login')
 
     uid = request.session['uid']
-    profile1 = CustomUser.objects.get(id=uid)
-    profile2=Register.objects.get(user_id=uid)
-    freelancer=FreelancerProfile.objects.get(user_id=uid)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
+    freelancer = viewer.freelancer
     
     if profile1.permission:
         portfolios = Document.objects.filter(user=uid)  # Fetch all documents created by the user
@@ -2269,8 +2190,9 @@ def view_complaints(request):
     if not request.user.is_authenticated or request.user.role != 'freelancer':
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=request.user.id)
-    profile2 = get_object_or_404(Register, user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     freelancer = get_object_or_404(FreelancerProfile, user_id=request.user.id)
     
     if profile1.permission:
@@ -2295,8 +2217,9 @@ def view_complaints_recieved(request):
     if not request.user.is_authenticated or request.user.role != 'freelancer':
         return redirect('login')
 
-    profile1 = get_object_or_404(CustomUser, id=request.user.id)
-    profile2 = get_object_or_404(Register, user_id=request.user.id)
+    viewer = get_viewer(request)
+    profile1 = viewer.user
+    profile2 = viewer.profile
     freelancer = get_object_or_404(FreelancerProfile, user_id=request.user.id)
     
     if profile1.permission: